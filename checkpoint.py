@@ -0,0 +1,110 @@
+"""
+CHECKPOINT - Tömör bináris tároló a szimulátor állapotához
+.npz-stílusú zip: tömbönként egy .npy tag + meta.json (skalárok, ID-k, nevek).
+
+Tömörítés nélkül a tagok ZIP_STORED módban kerülnek a fájlba, így betöltéskor
+közvetlenül memóriába képezhetők (np.memmap a tag adateltolásán) - nincs
+másolás és nincs újraszámolás, a költség nem függ a rács méretétől.
+compress='zlib': szabványos deflate (np.load-dal is olvasható)
+compress='zstd': tagonként zstd (a zstandard csomag szükséges hozzá)
+"""
+import io
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+FORMAT_VERSION = 1
+COMPRESSIONS = (None, 'zlib', 'zstd')
+
+# Zip helyi fejléc: 30 bájt + fájlnév + extra mező, utána jön az adat
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError("compress='zstd' a zstandard csomagot igényli (pip install zstandard)") from error
+    return zstandard
+
+
+def save_arrays(path, arrays, meta, compress=None):
+    """
+    Tömbök és metaadat mentése egy fájlba (atomikusan: ideiglenes fájl + csere)
+    arrays: {név: tömb}, meta: JSON-szerializálható dict
+    """
+    if compress not in COMPRESSIONS:
+        raise ValueError(f"Ismeretlen tömörítés: {compress} (választható: {COMPRESSIONS})")
+
+    tmp = f"{path}.tmp"
+    mode = zipfile.ZIP_DEFLATED if compress == 'zlib' else zipfile.ZIP_STORED
+    with zipfile.ZipFile(tmp, 'w', compression=mode, allowZip64=True) as zf:
+        header = {'version': FORMAT_VERSION, 'compress': compress}
+        zf.writestr('meta.json', json.dumps(dict(meta, checkpoint=header)))
+
+        for name, array in arrays.items():
+            array = np.asarray(array)
+            if compress == 'zstd':
+                buffer = io.BytesIO()
+                np.lib.format.write_array(buffer, array, allow_pickle=False)
+                zf.writestr(f"{name}.npy.zst", _zstd().ZstdCompressor().compress(buffer.getvalue()))
+            else:
+                with zf.open(f"{name}.npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, array, allow_pickle=False)
+
+    os.replace(tmp, path)
+
+
+def _data_offset(f, info):
+    """Egy tag adatainak kezdete a fájlban (a helyi fejléc után)"""
+    f.seek(info.header_offset)
+    fields = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+    if fields[0] != b'PK\x03\x04':
+        raise ValueError(f"Sérült checkpoint tag: {info.filename}")
+    name_length, extra_length = fields[-2:]
+    return info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+
+def _memmap_member(path, f, info):
+    """Tömörítetlen .npy tag memóriába képezve (copy-on-write: írható, a fájl nem változik)"""
+    f.seek(_data_offset(f, info))
+    version = np.lib.format.read_magic(f)
+    readers = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+    if version not in readers:
+        raise ValueError(f"Nem támogatott .npy verzió: {version} ({info.filename})")
+    shape, fortran_order, dtype = readers[version](f)
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='c', shape=shape, offset=f.tell(),
+                     order='F' if fortran_order else 'C')
+
+
+def load_arrays(path, mmap=True):
+    """
+    Checkpoint betöltése
+    mmap=True: a tömörítetlen tagok np.memmap-ként (lusta, laponkénti beolvasás)
+    Return: (arrays {név: tömb}, meta dict)
+    """
+    arrays = {}
+    with open(path, 'rb') as f, zipfile.ZipFile(f) as zf:
+        meta = json.loads(zf.read('meta.json'))
+        header = meta.pop('checkpoint', {})
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Nem támogatott checkpoint verzió: {header.get('version')}")
+
+        for info in zf.infolist():
+            if info.filename.endswith('.npy.zst'):
+                raw = _zstd().ZstdDecompressor().decompress(zf.read(info))
+                arrays[info.filename[:-8]] = np.lib.format.read_array(io.BytesIO(raw))
+            elif info.filename.endswith('.npy'):
+                name = info.filename[:-4]
+                if mmap and info.compress_type == zipfile.ZIP_STORED:
+                    arrays[name] = _memmap_member(path, f, info)
+                else:
+                    with zf.open(info) as member:
+                        arrays[name] = np.lib.format.read_array(member)
+
+    return arrays, meta
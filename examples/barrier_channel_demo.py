@@ -66,23 +66,19 @@ def main():
     # Evolve and observe flow
     print("\n6️⃣ Evolving system to observe energy flow...")
 
-    checkpoints = [0, 50, 100, 200]
+    # One compiled run, measuring every 50 steps inside the loop
+    record = stratos.evolve(steps=200, record_every=50,
+                            observables=['mode_energies', 'coherence'])
+    logic_idx = next(i for i, m in enumerate(stratos.modes) if m['name'] == "Logic")
 
-    for i, steps in enumerate(checkpoints):
-        if i == 0:
-            continue
+    for i, t in enumerate(record['time']):
+        energies = record['mode_energies'][i]
 
-        stratos.evolve(steps=steps - checkpoints[i-1])
-
-        vote = stratos.hope_genome_vote()
-        print(f"\n   After {steps} steps (t={stratos.time:.2f}):")
-        print(f"   Coherence: {vote['coherence']:.3f}")
-
-        energies = stratos.measure_mode_energies()
+        print(f"\n   After {50 * (i + 1)} steps (t={t:.2f}):")
+        print(f"   Coherence: {record['coherence'][i]:.3f}")
 
         # Find Intuition and Logic energies
         intuition_energy = energies[intuition_idx]
-        logic_idx = next(i for i, m in enumerate(stratos.modes) if m['name'] == "Logic")
         logic_energy = energies[logic_idx]
         brain_energy = energies[0]
 
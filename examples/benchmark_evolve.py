@@ -0,0 +1,80 @@
+"""
+EVOLVE BENCHMARK - Fused Multi-Step Kernel
+
+This example compares two ways of running the split-step integrator:
+1. The old pattern: one JIT call to `_gpe_step_2d` per step from Python
+2. `evolve(steps)`: all steps fused into a single XLA program (lax.fori_loop),
+   with a cached kinetic propagator and Strang-fused half-kicks
+   (one FFT pair per step instead of two)
+
+It also checks that both paths produce the same ψ.
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+
+
+def per_step_loop(stratos, steps):
+    """Reference: Python loop dispatching one JIT call per step"""
+    j_V = stratos.V
+    j_K2 = stratos.K2
+    psi = stratos.ψ
+    for _ in range(steps):
+        psi = stratos._gpe_step_2d(psi, j_V, stratos.g, stratos.dt, j_K2,
+                                   stratos.gamma, stratos.kinetic_scale)
+    return psi.block_until_ready()
+
+
+def fused(stratos, steps):
+    """Fused kernel used by evolve()"""
+    psi = stratos._evolve_n(stratos.ψ, stratos.V, stratos.g, stratos.dt,
+                            stratos._kinetic_propagator(), stratos.gamma, steps)
+    return psi.block_until_ready()
+
+
+def best_of(fn, repeats=5):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    print("⏱️ EVOLVE BENCHMARK - Per-step dispatch vs fused kernel")
+    print("=" * 60)
+
+    for grid in [(32, 32), (64, 64), (128, 128)]:
+        stratos = FluidSTRATOS(grid_size=grid)
+        stratos.excite_mode(0, strength=2.0)
+        steps = 200
+
+        # Warm-up (compilation)
+        ref = per_step_loop(stratos, steps)
+        out = fused(stratos, steps)
+
+        # Different step count must not trigger a recompile
+        fused(stratos, steps // 2)
+
+        t_loop = best_of(lambda: per_step_loop(stratos, steps))
+        t_fused = best_of(lambda: fused(stratos, steps))
+
+        err = float(np.max(np.abs(np.asarray(out) - np.asarray(ref))))
+        print(f"\n   Grid {grid[0]}×{grid[1]}, {steps} steps:")
+        print(f"      Per-step loop: {t_loop*1e3:8.2f} ms")
+        print(f"      Fused kernel:  {t_fused*1e3:8.2f} ms")
+        print(f"      Speedup:       {t_loop/t_fused:8.1f}×")
+        print(f"      max|Δψ|:       {err:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+INTEGRATOR BENCHMARK - Error vs Wall-Clock
+
+This example compares the split-step schemes selectable via
+`FluidSTRATOS(integrator=...)`:
+1. strang   - 2nd order (default)
+2. yoshida4 - 4th order triple jump (same composition as Forest-Ruth)
+3. suzuki4  - 4th order 5-stage fractal (more FFTs, smaller error constant)
+
+Each scheme is run to t=1 at several time steps and compared against a
+fine-step reference. Pass a grid size to benchmark larger fields:
+
+    python examples/benchmark_integrators.py 256
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+
+
+T_END = 1.0
+
+
+def run(grid, integrator, dt):
+    """Evolve an excited field to T_END, return (ψ, seconds)"""
+    stratos = FluidSTRATOS(grid_size=(grid, grid), integrator=integrator)
+    stratos.dt = dt
+    stratos.excite_mode(0, strength=2.0)
+    steps = int(round(T_END / dt))
+
+    stratos.evolve(steps=steps)  # Warm-up (compilation)
+    stratos.ψ.block_until_ready()
+
+    stratos = FluidSTRATOS(grid_size=(grid, grid), integrator=integrator)
+    stratos.dt = dt
+    stratos.excite_mode(0, strength=2.0)
+    t0 = time.perf_counter()
+    stratos.evolve(steps=steps)
+    stratos.ψ.block_until_ready()
+    return np.asarray(stratos.ψ), time.perf_counter() - t0
+
+
+def main():
+    grid = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    dx = 20.0 / grid
+
+    print("📐 INTEGRATOR BENCHMARK - Error vs Wall-Clock")
+    print("=" * 60)
+    print(f"   Grid {grid}×{grid}, t = 0 → {T_END}")
+
+    reference, _ = run(grid, 'suzuki4', 0.005)
+
+    print(f"\n   {'Scheme':10s} {'dt':>7s} {'L2 error':>10s} {'Time [ms]':>10s}")
+    for integrator in ['strang', 'yoshida4', 'suzuki4']:
+        for dt in [0.2, 0.1, 0.05, 0.025]:
+            psi, seconds = run(grid, integrator, dt)
+            error = np.sqrt(np.sum(np.abs(psi - reference)**2) * dx**2)
+            print(f"   {integrator:10s} {dt:7.3f} {error:10.2e} {seconds*1e3:10.2f}")
+        print()
+
+    print("Errors flatten out near ~1e-5, the single-precision round-off floor.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+CHECKPOINT & RESUME - Saving and Restoring the Full Simulator State
+
+This example:
+1. Builds a 512² field with a barrier, a channel and a few memories
+2. Saves it together with an RL gardener (uncompressed and zlib)
+3. Loads it back memory-mapped and times the resume
+4. Checks that the restored run continues bit-for-bit like the original
+5. Resumes gardener training across two train_gardener() calls
+"""
+
+import sys
+import os
+import time
+import contextlib
+import io
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+from rl_gardener import RLGardener, train_gardener
+
+
+def main():
+    print("💾 CHECKPOINT & RESUME - Full Simulator State")
+    print("=" * 60)
+    quiet = lambda: contextlib.redirect_stdout(io.StringIO())
+
+    # 1. A run worth saving
+    print("\n1️⃣ Building a 512² run...")
+    stratos = FluidSTRATOS(grid_size=(512, 512))
+    with quiet():
+        stratos.set_barrier((0, 0), strength=1.0, width=1.5, barrier_id="brain_shield")
+        stratos.add_coupling("Intuition", "Logic", strength=2.0)
+        stratos.emotimem_store_batch([(3.0, 4.0), (-2.0, 3.5)], [0.9, 0.8], [1.0, -1.0])
+        stratos.evolve(steps=50)
+    gardener = RLGardener(seed=0)
+
+    with tempfile.TemporaryDirectory() as folder:
+        # 2-3. Save and load in both formats
+        print("\n2️⃣ Save / load:")
+        for compress in [None, 'zlib']:
+            path = os.path.join(folder, f"run_{compress or 'raw'}.npz")
+            with quiet():
+                t0 = time.perf_counter()
+                stratos.save(path, gardener=gardener, compress=compress)
+                t_save = time.perf_counter() - t0
+
+            FluidSTRATOS.load(path)  # First call also initialises the JAX runtime
+            t0 = time.perf_counter()
+            restored = FluidSTRATOS.load(path)
+            t_load = time.perf_counter() - t0
+            print(f"   {compress or 'uncompressed':12s}: {os.path.getsize(path) / 1e6:5.1f} MB, "
+                  f"save {1000 * t_save:6.1f} ms, load {1000 * t_load:6.1f} ms")
+
+        # 4. Continue both runs and compare
+        print("\n3️⃣ Continuing both runs for 20 steps...")
+        with quiet():
+            stratos.evolve(steps=20)
+            restored.evolve(steps=20)
+        same = np.array_equal(np.asarray(stratos.ψ), np.asarray(restored.ψ))
+        print(f"   Identical ψ: {same}, t = {restored.time:.2f}, "
+              f"barriers: {list(restored.active_barriers)}, memories: {len(restored.memories)}")
+        print(f"   Gardener restored: {RLGardener.load(path).actions}")
+
+        # 5. Gardener training that survives a restart
+        print("\n4️⃣ Training the gardener in two sessions...")
+        checkpoint = os.path.join(folder, "gardener.npz")
+        with quiet():
+            first = train_gardener(episodes=2, steps_per_episode=10, checkpoint=checkpoint)
+            second = train_gardener(episodes=2, steps_per_episode=10, checkpoint=checkpoint)
+        print(f"   Non-zero Q entries after session 1: {int(np.count_nonzero(first.q_table))}, "
+              f"after session 2: {int(np.count_nonzero(second.q_table))}")
+
+    print("\n✨ Checkpoint demo complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+DIFFERENTIABLE SIMULATION - Gradients Through the Physics
+
+This example uses the functional `simulate(params, psi0, steps)` API:
+1. Brain Shield barrier + Intuition ↔ Logic channel as a parameter pytree
+2. jax.grad of the final Brain energy with respect to barrier strength,
+   channel depth, viscosity (kinetic_scale) and g
+3. A check of each gradient against a central finite difference
+4. A few plain gradient steps pulling Brain energy toward a target
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import jax
+
+from fluid_stratos import FluidSTRATOS
+
+
+STEPS = 200
+TARGET = 0.25
+
+
+def main():
+    print("🧮 DIFFERENTIABLE SIMULATION - Gradients Through the Physics")
+    print("=" * 60)
+
+    stratos = FluidSTRATOS(grid_size=(64, 64))
+    stratos.set_barrier((0, 0), strength=0.8, width=2.0, barrier_id="brain_shield")
+    stratos.add_coupling("Intuition", "Logic", strength=2.0)
+    stratos.excite_mode(0, strength=2.0)
+
+    params = stratos.get_params()
+    psi0 = stratos.ψ
+
+    def brain_energy(params):
+        return stratos.simulate(params, psi0, steps=STEPS, observables=['brain_energy'])['brain_energy']
+
+    # 1. Gradients vs finite differences
+    print(f"\n1️⃣ ∂(Brain energy)/∂θ after {STEPS} steps:")
+    grads = jax.grad(brain_energy)(params)
+    checks = [('barrier strength', 'barriers', (0, 2)),
+              ('channel depth', 'channels', (0, 4)),
+              ('kinetic_scale', 'kinetic_scale', ()),
+              ('g', 'g', ())]
+
+    print(f"\n   {'Parameter':18s} {'autodiff':>12s} {'finite diff':>12s}")
+    for label, name, index in checks:
+        eps = 1e-2
+        plus = {k: np.array(v) for k, v in params.items()}
+        minus = {k: np.array(v) for k, v in params.items()}
+        plus[name][index] += eps
+        minus[name][index] -= eps
+        fd = (brain_energy(plus) - brain_energy(minus)) / (2 * eps)
+        print(f"   {label:18s} {float(grads[name][index]):12.5f} {float(fd):12.5f}")
+
+    # 2. Gradient descent on the landscape
+    print(f"\n2️⃣ Gradient steps toward Brain energy = {TARGET}:")
+    def loss(params):
+        energy = brain_energy(params)
+        return (energy - TARGET)**2, energy
+
+    value_and_grad = jax.jit(jax.value_and_grad(loss, has_aux=True))
+
+    for it in range(8):
+        (_, energy), grads = value_and_grad(params)
+        print(f"   Iter {it}: Brain = {float(energy):.4f}")
+        params = dict(params,
+                      barriers=params['barriers'] - 20.0 * grads['barriers'],
+                      channels=params['channels'] - 20.0 * grads['channels'])
+
+    print(f"\n   Barrier strength: {float(params['barriers'][0, 2]):.3f}")
+    print(f"   Channel depth:    {float(params['channels'][0, 4]):.3f}")
+
+    print("\n✨ Differentiable simulation complete!")
+
+
+if __name__ == "__main__":
+    main()
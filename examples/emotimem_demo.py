@@ -65,14 +65,14 @@ def main():
         print(f"      Intensity: {mem['intensity']} | Valence: {mem['valence']:+.1f}")
         print(f"      '{mem['description']}'")
 
-        stratos.emotimem_store(
-            experience_position=mem['position'],
-            emotion_intensity=mem['intensity'],
-            emotion_valence=mem['valence']
-        )
-
-        # Let the memory settle
-        stratos.evolve(steps=20)
+    # Store them all in one compiled call; each memory settles for 20 steps
+    # before the next one arrives (same as emotimem_store + evolve(steps=20))
+    stratos.emotimem_store_batch(
+        positions=[mem['position'] for mem in memories_to_store],
+        intensities=[mem['intensity'] for mem in memories_to_store],
+        valences=[mem['valence'] for mem in memories_to_store],
+        settle_steps=20
+    )
 
     # Let the system stabilize
     print("\n3️⃣ Allowing memories to stabilize...")
@@ -106,9 +106,13 @@ def main():
         )
 
         print(f"   Activated {len(recalled)} memory region(s):")
-        for i, rec in enumerate(recalled[:3]):  # Top 3
-            print(f"      #{i+1}: Position {rec['position']}, "
-                  f"Intensity {rec['intensity']:.4f}")
+        for i, rec in enumerate(recalled[:3]):  # Top 3 (strongest first)
+            x, y = rec['position']
+            # Peaks are attributed to the nearest stored memory (ids follow storage order)
+            source = (memories_to_store[rec['memory']['id']]['name']
+                      if rec['memory'] is not None else "unattributed")
+            print(f"      #{i+1}: Position ({x:+.2f}, {y:+.2f}), "
+                  f"Intensity {rec['intensity']:.4f}  <- {source}")
 
         print()
 
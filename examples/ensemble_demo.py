@@ -0,0 +1,92 @@
+"""
+ENSEMBLE DEMO - Many Cognitive Fields at Once
+
+This example demonstrates batched simulation with FluidEnsemble:
+1. A population of fields with different viscosities and barrier heights
+2. Advancing all of them in one vmapped call
+3. Batched mode energies and coherence
+4. Timing against running the same fields one after another (both warmed up,
+   best of 5 rounds)
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+from fluid_ensemble import FluidEnsemble
+
+
+def best_of(fn, repeats=5):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def batched_round(ensemble, steps):
+    ensemble.evolve(steps=steps)
+    return ensemble.get_state_metrics()
+
+
+def sequential_round(systems, steps):
+    for stratos in systems:
+        stratos.evolve(steps=steps)
+        stratos.get_state_metrics()
+
+
+def main():
+    print("🌊 ENSEMBLE DEMO - Batched Cognitive Fields")
+    print("=" * 60)
+
+    B = 16
+    steps = 100
+    viscosities = np.linspace(0.0, 1.0, B)
+    barriers = np.linspace(0.0, 2.0, B)
+
+    # Build the population
+    print(f"\n1️⃣ Creating {B} fields (viscosity 0 → 1, barrier 0 → 2)...")
+    ensemble = FluidEnsemble(B, grid_size=(64, 64))
+    ensemble.set_viscosity(viscosities)
+    ensemble.set_barrier((0, 0), strength=barriers, width=2.0, barrier_id="brain_shield")
+    ensemble.excite_mode(0, strength=2.0)
+
+    # This first round also compiles evolve, the metrics and coherence
+    print(f"\n2️⃣ Evolving all fields together ({steps} steps)...")
+    brain, entropy = batched_round(ensemble, steps)
+    coherence = ensemble.coherence()
+    print(f"\n   {'Visc':>6s} {'Barrier':>8s} {'Brain':>8s} {'Entropy':>8s} {'Coher.':>8s}")
+    for i in range(0, B, 3):
+        print(f"   {viscosities[i]:6.2f} {barriers[i]:8.2f} {brain[i]:8.3f} "
+              f"{entropy[i]:8.3f} {coherence[i]:8.3f}")
+
+    # Same population, one field at a time
+    print("\n3️⃣ Same population, sequentially...")
+    systems = []
+    for v, b in zip(viscosities, barriers):
+        stratos = FluidSTRATOS(grid_size=(64, 64))
+        stratos.set_viscosity(v)
+        stratos.set_barrier((0, 0), strength=b, width=2.0, barrier_id="brain_shield")
+        stratos.excite_mode(0, strength=2.0)
+        systems.append(stratos)
+    sequential_round(systems, 1)  # Warm-up (compilation)
+
+    # Both paths warmed up; best of 5 rounds of evolve + metrics
+    t_batched = best_of(lambda: batched_round(ensemble, steps))
+    t_serial = best_of(lambda: sequential_round(systems, steps))
+
+    print(f"\n   Batched:    {t_batched*1e3:8.1f} ms")
+    print(f"   Sequential: {t_serial*1e3:8.1f} ms")
+
+    print("\n✨ Ensemble demo complete!")
+
+
+if __name__ == "__main__":
+    main()
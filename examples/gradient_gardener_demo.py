@@ -0,0 +1,87 @@
+"""
+GRADIENT GARDENER DEMO - Homeostasis by Differentiation
+
+This example puts the GradientGardener next to the CognitiveGardener:
+1. Same field, same target, same perturbation at t=200
+2. CognitiveGardener: P-controller on the barrier (fixed gain)
+3. GradientGardener: Adam on barrier strength and channel depth, using
+   gradients of the mode-energy error over a simulated horizon
+4. Tracking error and simulated-step budget (vs. 60×50×10 steps
+   for `train_gardener`)
+"""
+
+import sys
+import os
+import io
+import contextlib
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+from cognitive_gardener import CognitiveGardener
+from gradient_gardener import GradientGardener
+
+
+TARGET = 0.25
+TOTAL_STEPS = 400
+CONTROL_INTERVAL = 10
+PERTURBATION_TIME = 200
+
+
+def run(make_gardener):
+    """Control loop shared by both gardeners, returns brain energy per decision"""
+    stratos = FluidSTRATOS(grid_size=(64, 64))
+    gardener = make_gardener(stratos)
+
+    for t in range(0, TOTAL_STEPS, CONTROL_INTERVAL):
+        brain_energy = gardener.observe()
+        barrier = gardener.act(brain_energy)
+        gardener.log(t, brain_energy, barrier)
+
+        if t == PERTURBATION_TIME:
+            stratos.excite_mode(0, strength=2.0)
+
+        stratos.evolve(steps=CONTROL_INTERVAL)
+
+    return gardener
+
+
+def cognitive(stratos):
+    stratos.set_barrier((0, 0), strength=0.5, width=2.0, barrier_id="brain_shield")
+    return CognitiveGardener(stratos, target_brain_energy=TARGET)
+
+
+def gradient(stratos):
+    return GradientGardener(stratos, target_brain_energy=TARGET)
+
+
+def main():
+    print("🌿 GRADIENT GARDENER - Homeostasis by Differentiation")
+    print("=" * 60)
+    print(f"   Target brain energy: {TARGET}, perturbation at t={PERTURBATION_TIME}")
+
+    # Silence the per-tick landscape messages during the control loops
+    with contextlib.redirect_stdout(io.StringIO()):
+        gardeners = {'Cognitive (P)': run(cognitive), 'Gradient (Adam)': run(gradient)}
+
+    print(f"\n   {'Gardener':16s} {'mean|err|':>10s} {'after pert.':>12s} {'final':>8s}")
+    for name, gardener in gardeners.items():
+        energies = np.array(gardener.history['brain_energy'])
+        error = np.abs(energies - TARGET)
+        after = error[PERTURBATION_TIME // CONTROL_INTERVAL:]
+        print(f"   {name:16s} {error.mean():10.4f} {after.mean():12.4f} {energies[-1]:8.4f}")
+
+    gradient_gardener = gardeners['Gradient (Adam)']
+    print(f"\n   Final barrier:  {gradient_gardener.barrier_strength:.3f}")
+    print(f"   Final channel:  {gradient_gardener.channel_depth:.3f}")
+    print(f"   Simulated steps for optimisation: {gradient_gardener.simulated_steps}"
+          f" (train_gardener: {60 * 50 * 10})")
+
+    print("\n✨ Gradient gardener demo complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+MEMORY CONSOLIDATION - Compacting a Long EmotiMem Session
+
+This example simulates a long session in which the same few experiences are
+stored again and again (with some jitter), then:
+1. Recalls with the crowded catalogue and field
+2. Consolidates: nearby memories merge into one representative, decayed ones
+   are pruned, and ψ is re-seeded from the compact set
+3. Recalls again and compares catalogue size, attribution and timing
+"""
+
+import sys
+import os
+import time
+import contextlib
+import io
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+
+
+THEMES = {
+    'Family': (-5.0, 4.0),
+    'Work': (4.0, 4.5),
+    'Music': (-4.0, -5.0),
+    'Travel': (5.0, -4.0),
+}
+ROUNDS = 10
+PER_ROUND = 100
+
+
+def timed_recall(stratos, context):
+    """Recall with printing silenced; returns (results, seconds)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        recalled = stratos.emotimem_recall(context)
+        seconds = time.perf_counter() - t0
+    return recalled, seconds
+
+
+def report(stratos, label):
+    print(f"\n   {label}: {len(stratos.memories)} memories in the catalogue")
+    for name, context in THEMES.items():
+        recalled, seconds = timed_recall(stratos, context)
+        attributed = sum(r['memory'] is not None for r in recalled)
+        print(f"      {name:7s}: {len(recalled)} peaks, {attributed} attributed, "
+              f"{1000 * seconds:6.1f} ms")
+
+
+def main():
+    print("🧹 MEMORY CONSOLIDATION - Compacting a Long EmotiMem Session")
+    print("=" * 60)
+
+    stratos = FluidSTRATOS(grid_size=(128, 128))
+    rng = np.random.default_rng(0)
+    centers = np.array(list(THEMES.values()))
+
+    # 1. A long session: every round re-experiences the themes with jitter
+    print(f"\n1️⃣ Storing {ROUNDS} × {PER_ROUND} experiences...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(ROUNDS):
+            theme = rng.integers(0, len(THEMES), PER_ROUND)
+            stratos.emotimem_store_batch(
+                positions=centers[theme] + rng.normal(0, 0.3, (PER_ROUND, 2)),
+                intensities=rng.uniform(0.5, 1.0, PER_ROUND),
+                valences=rng.uniform(-1, 1, PER_ROUND)
+            )
+            stratos.evolve(steps=50)
+        # Warm-up (compilation) so the timings below compare recall only
+        stratos.emotimem_recall((0.0, 0.0))
+
+    report(stratos, "Before")
+
+    # 2. Consolidation
+    print("\n2️⃣ Consolidating...")
+    stratos.emotimem_consolidate(merge_radius=1.0, min_intensity=0.05,
+                                 reseed=True, settle_steps=10)
+    for memory in stratos.memories.records():
+        x, y = memory['position']
+        print(f"      id={memory['id']:4d}  ({x:+.2f}, {y:+.2f})  I={memory['intensity']:.2f}")
+
+    # 3. After
+    report(stratos, "After")
+
+    print("\n✨ Consolidation complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+PRECISION CHECK - float32 vs float64 Accuracy Regression
+
+This example runs the same scenario at both precisions:
+1. Brain Shield barrier + Intuition ↔ Logic channel
+2. Intuition excitation
+3. Mode-energy trajectory recorded inside the compiled evolve loop
+
+It exits with code 1 if the float32 trajectory drifts from the float64
+one by more than the tolerance; the CI gate for this is
+tests/test_precision.py.
+
+float64 needs JAX's x64 mode, which is process-wide and must be set before
+JAX is used, so this script enables it at startup (JAX_ENABLE_X64=1).
+"""
+
+import sys
+import os
+import time
+
+# float64 needs JAX x64 mode, which must be on before JAX is imported
+os.environ.setdefault("JAX_ENABLE_X64", "1")
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+
+
+TOLERANCE = 5e-5   # max |ΔE| on normalized mode energies
+STEPS = 1000
+RECORD_EVERY = 10
+
+
+def trajectory(precision, grid=64):
+    stratos = FluidSTRATOS(grid_size=(grid, grid), precision=precision)
+    stratos.add_barrier((0, 0), strength=0.8, width=2.0, barrier_id="brain_shield")
+    stratos.add_coupling("Intuition", "Logic", strength=3.0)
+    stratos.excite_mode(6, strength=4.0)
+
+    # Warm-up (compilation), then a timed run from the same state
+    stratos.evolve(steps=STEPS, record_every=RECORD_EVERY)
+    stratos.excite_mode(6, strength=4.0)
+
+    t0 = time.perf_counter()
+    record = stratos.evolve(steps=STEPS, record_every=RECORD_EVERY)
+    seconds = time.perf_counter() - t0
+    return record['mode_energies'], seconds, stratos.ψ.nbytes
+
+
+def main():
+    print("🎯 PRECISION CHECK - float32 vs float64")
+    print("=" * 60)
+
+    e32, t32, bytes32 = trajectory('float32')
+    e64, t64, bytes64 = trajectory('float64')
+
+    drift = np.max(np.abs(e32 - e64), axis=1)
+
+    print(f"\n   {'':10s} {'float32':>12s} {'float64':>12s}")
+    print(f"   {'ψ bytes':10s} {bytes32:12d} {bytes64:12d}")
+    print(f"   {'Time [ms]':10s} {t32*1e3:12.1f} {t64*1e3:12.1f}")
+
+    print(f"\n   Max |ΔE| over {len(drift)} records: {drift.max():.2e} (tolerance {TOLERANCE:.0e})")
+    print(f"   At t=25%/50%/100%: {drift[len(drift)//4]:.2e} / {drift[len(drift)//2]:.2e} / {drift[-1]:.2e}")
+
+    if drift.max() > TOLERANCE:
+        print("\n❌ float32 trajectory drifted beyond tolerance")
+        sys.exit(1)
+
+    print("\n✅ float32 matches float64 within tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+TRAJECTORY RECORDING - Streaming ψ Snapshots to Disk
+
+This example records a 256² run without keeping it in memory:
+1. evolve(..., trajectory=writer) streams |ψ|² every 10 steps as float16;
+   a background thread copies and writes frames while the physics runs
+2. The recording is read back memory-mapped: single frames by index,
+   plus the time axis, without loading the whole file
+3. Overhead vs a plain evolve(), and a few frames saved as an image
+"""
+
+import sys
+import os
+import time
+import contextlib
+import io
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from fluid_stratos import FluidSTRATOS
+from trajectory import TrajectoryReader
+
+
+STEPS = 2000
+EVERY = 10
+
+
+def main():
+    print("🎞️ TRAJECTORY RECORDING - Streaming ψ Snapshots to Disk")
+    print("=" * 60)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        stratos = FluidSTRATOS(grid_size=(256, 256))
+        stratos.excite_mode(0, strength=2.0)
+        stratos.emotimem_store((3.0, 4.0), 0.9, 1.0)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "run.npy")
+
+        # Warm-up (compilation of the evolve and frame kernels)
+        with stratos.trajectory_writer(os.path.join(folder, "warmup.npy"), every=EVERY) as writer:
+            stratos.evolve(steps=EVERY, trajectory=writer)
+        stratos.evolve(steps=EVERY)
+        stratos.ψ.block_until_ready()
+
+        # 1. Plain vs streamed
+        print(f"\n1️⃣ {STEPS} steps on 256², a frame every {EVERY} steps...")
+        t0 = time.perf_counter()
+        stratos.evolve(steps=STEPS)
+        stratos.ψ.block_until_ready()
+        t_plain = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with stratos.trajectory_writer(path, every=EVERY, quantity='density', dtype='float16') as writer:
+            stratos.evolve(steps=STEPS, trajectory=writer)
+        t_stream = time.perf_counter() - t0
+
+        print(f"   Plain evolve:     {t_plain:6.2f} s")
+        print(f"   With recording:   {t_stream:6.2f} s ({writer.n_frames} frames, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB)")
+
+        # 2. Random access
+        print("\n2️⃣ Reading back (memory-mapped)...")
+        reader = TrajectoryReader(path)
+        t0 = time.perf_counter()
+        frame = np.asarray(reader[len(reader) // 2], dtype=np.float32)
+        t_read = time.perf_counter() - t0
+        print(f"   {len(reader)} frames of {reader.frames.shape[1:]} {reader.frames.dtype}, "
+              f"t = {reader.times[0]:.2f} … {reader.times[-1]:.2f}")
+        print(f"   Frame {len(reader) // 2}: peak density {frame.max():.4f}, "
+              f"read in {1000 * t_read:.2f} ms")
+
+        # 3. A few frames
+        print("\n3️⃣ Saving frames...")
+        picks = np.linspace(0, len(reader) - 1, 4).astype(int)
+        fig, axes = plt.subplots(1, 4, figsize=(16, 4))
+        for ax, index in zip(axes, picks):
+            ax.imshow(np.asarray(reader[index], dtype=np.float32), extent=reader.meta['extent'],
+                      origin='lower', cmap='inferno')
+            ax.set_title(f"t = {reader.times[index]:.1f}")
+            ax.axis('off')
+        plt.tight_layout()
+        plt.savefig('trajectory_frames.png', dpi=100)
+        plt.close(fig)
+        print("   Saved to: trajectory_frames.png")
+
+    print("\n✨ Trajectory recording complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+FLUID ENSEMBLE - Sok kognitív mező egyszerre
+B darab független FluidSTRATOS mező, egyetlen vmap-olt hívással léptetve
+"""
+from functools import partial
+
+import numpy as np
+import jax.numpy as jnp
+from jax import jit, vmap
+
+from fluid_stratos import FluidSTRATOS
+
+
+class FluidEnsemble:
+    """
+    B mező közös rácson, tagonként saját V, kinetic_scale, g és gamma értékkel
+
+    Az egész populáció léptetése egy fordított program, így B környezet
+    nagyjából egyetlen szimuláció dispatch-költségébe kerül.
+    """
+
+    def __init__(self,
+                 batch_size,
+                 grid_size=(64, 64),
+                 domain_size=20.0,
+                 n_modes=16,
+                 integrator='strang',
+                 precision='float32'):
+
+        # A közös rács, módok és statikus tájkép egy sablon rendszerből jön
+        self.base = FluidSTRATOS(grid_size=grid_size, domain_size=domain_size,
+                                 n_modes=n_modes, integrator=integrator, precision=precision)
+        self.real_dtype = self.base.real_dtype
+        self.complex_dtype = self.base.complex_dtype
+
+        self.B = batch_size
+        self.Nx, self.Ny = self.base.Nx, self.base.Ny
+        self.L = self.base.L
+        self.dx = self.base.dx
+        self.X, self.Y = self.base.X, self.base.Y
+        self.K2 = self.base.K2
+        self.modes = self.base.modes
+        self.mode_names = self.base.mode_names
+
+        # Tagonkénti mezők: (B, Ny, Nx)
+        self.ψ = jnp.broadcast_to(self.base.ψ, (self.B,) + self.base.ψ.shape)
+
+        # Tagonkénti fizika paraméterek (host oldali kis tömbök)
+        self.dt = self.base.dt
+        self.g = np.full(self.B, self.base.g)
+        self.gamma = np.full(self.B, self.base.gamma)
+        self.kinetic_scale = np.full(self.B, self.base.kinetic_scale)
+        self.integrator = integrator
+        self._kinetic_key = None
+        self._kinetic_cache = None
+
+        # Tájkép: közös statikus rész + tagonkénti paramétertáblák
+        # gátak {id: (B, 4)}, csatornák {id: (B, 5)} - lásd FluidSTRATOS.landscape_params
+        self.V_static = self.base.V_static
+        self.active_barriers = {}
+        self.active_couplings = {}
+        self._update_total_potential()
+
+        # Mód súlymátrix (16, Nx·Ny) a sablonból
+        self._mode_weights = self.base._mode_weights
+
+        self.time = 0.0
+
+    def _per_member(self, value):
+        """Skalár vagy (B,) érték -> (B,) tömb"""
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.B,)).copy()
+
+    _batch_synthesize = staticmethod(jit(vmap(FluidSTRATOS._synthesize_potential,
+                                              in_axes=(None, None, None, 0, 0))))
+
+    def landscape_params(self):
+        """
+        Tagonkénti paramétertáblák
+        Return: (barriers (B, n, 4), channels (B, m, 5))
+        """
+        barriers = np.stack(list(self.active_barriers.values()), axis=1) \
+            if self.active_barriers else np.zeros((self.B, 0, 4))
+        channels = np.stack(list(self.active_couplings.values()), axis=1) \
+            if self.active_couplings else np.zeros((self.B, 0, 5))
+        return barriers, channels
+
+    def _update_total_potential(self):
+        """Tagonkénti potenciál (B, Ny, Nx) a paramétertáblákból, egy vmap-olt kernelben"""
+        barriers, channels = self.landscape_params()
+        self.V = self._batch_synthesize(
+            *self.base._landscape_dev,
+            jnp.asarray(barriers, dtype=self.real_dtype),
+            jnp.asarray(channels, dtype=self.real_dtype)
+        )
+
+    def set_barrier(self, position, strength=0.5, width=1.0, barrier_id=None):
+        """
+        Gát beállítása minden tagban
+        position: (x, y) vagy (B, 2) tömb; strength, width: skalár vagy (B,) tömb
+        """
+        position = np.broadcast_to(np.asarray(position, dtype=float), (self.B, 2))
+        if barrier_id is None:
+            barrier_id = f"barrier_{position[0, 0]}_{position[0, 1]}"
+
+        self.active_barriers[barrier_id] = np.column_stack([
+            position, self._per_member(strength), self._per_member(width)
+        ])
+        self._update_total_potential()
+
+    def add_coupling(self, mode_name1, mode_name2, strength=1.0, coupling_id=None):
+        """
+        Csatorna nyitása két mód között minden tagban
+        strength: skalár vagy (B,) tömb; meglévő ID esetén a mélység hozzáadódik
+        """
+        if coupling_id is None:
+            coupling_id = f"coupling_{mode_name1}_{mode_name2}"
+
+        old = self.active_couplings.get(coupling_id)
+        depth = self._per_member(strength) + (old[:, 4] if old is not None else 0.0)
+        self.set_coupling(mode_name1, mode_name2, depth, coupling_id)
+
+    def set_coupling(self, mode_name1, mode_name2, strength=1.0, coupling_id=None):
+        """
+        Csatorna beállítása (előző felülírása) minden tagban
+        strength: skalár vagy (B,) tömb
+        """
+        if coupling_id is None:
+            coupling_id = f"coupling_{mode_name1}_{mode_name2}"
+
+        pos1 = self.base.get_mode_position(mode_name1)
+        pos2 = self.base.get_mode_position(mode_name2)
+
+        if pos1 is None or pos2 is None:
+            print(f"⚠️ Hiba: Nem található mód ({mode_name1} vagy {mode_name2})")
+            return
+
+        endpoints = np.broadcast_to([*pos1, *pos2], (self.B, 4))
+        self.active_couplings[coupling_id] = np.column_stack([endpoints, self._per_member(strength)])
+        self._update_total_potential()
+
+    def remove_coupling(self, coupling_id):
+        """Csatorna törlése ID alapján minden tagból"""
+        if self.active_couplings.pop(coupling_id, None) is None:
+            print(f"⚠️ Hiba: Nem található kapcsolat ({coupling_id})")
+            return
+        self._update_total_potential()
+
+    def set_viscosity(self, level):
+        """
+        Viszkozitás tagonként (skalár vagy (B,) tömb, 0.0 - 1.0)
+        """
+        level = self._per_member(level)
+        self.kinetic_scale = 1.0 - 0.9 * np.clip(level, 0.0, 1.0)
+        self._kinetic_key = None
+
+    def _coeffs(self):
+        """Az ensemble integrátorának al-lépés együtthatói"""
+        return FluidSTRATOS.INTEGRATORS[self.integrator][1]
+
+    def _kinetic_propagator(self):
+        """Tagonkénti kinetikus rúgások (B, s+1, Ny, Nx), gyorsítótárral"""
+        key = (self.dt, self.kinetic_scale.tobytes(), self.integrator)
+        if self._kinetic_key != key:
+            ks = jnp.asarray(self.kinetic_scale, dtype=self.K2.dtype)
+            ops = partial(FluidSTRATOS._kinetic_ops, self.K2, self.dt, coeffs=self._coeffs())
+            self._kinetic_cache = vmap(ops)(ks)
+            self._kinetic_key = key
+        return self._kinetic_cache
+
+    @staticmethod
+    @partial(jit, static_argnames=('coeffs',))
+    def _evolve_batch(ψ, V, g, dt, kinetic_ops, gamma, steps, dx, coeffs=(1.0,)):
+        """A fúzionált split-step kernel vmap-olva a tagokra, normalizálással"""
+        evolve_one = partial(FluidSTRATOS._evolve_n, coeffs=coeffs)
+        ψ = vmap(evolve_one, in_axes=(0, 0, 0, None, 0, 0, None))(
+            ψ, V, g, dt, kinetic_ops, gamma, steps
+        )
+        norm = jnp.sqrt(jnp.sum(jnp.abs(ψ)**2, axis=(1, 2)) * dx**2)
+        return ψ / norm[:, None, None]
+
+    def evolve(self, steps=100):
+        """
+        Minden tag léptetése egyszerre
+        """
+        self.ψ = self._evolve_batch(
+            self.ψ,
+            self.V,
+            jnp.asarray(self.g, dtype=self.real_dtype),
+            self.dt,
+            self._kinetic_propagator(),
+            jnp.asarray(self.gamma, dtype=self.real_dtype),
+            steps,
+            self.dx,
+            self._coeffs()
+        )
+        self.time += steps * self.dt
+
+    def excite_mode(self, mode_index, strength=1.0):
+        """
+        Mód gerjesztése minden tagban (strength: skalár vagy (B,) tömb)
+        """
+        pattern = jnp.asarray(np.real(self.modes[mode_index]['pattern'](self.X, self.Y)),
+                              dtype=self.real_dtype)
+        kick = jnp.asarray(self._per_member(strength), dtype=pattern.dtype)
+        ψ = self.ψ * jnp.exp(1j * kick[:, None, None] * pattern[None])
+        norm = jnp.sqrt(jnp.sum(jnp.abs(ψ)**2, axis=(1, 2)) * self.dx**2)
+        self.ψ = ψ / norm[:, None, None]
+
+    _batch_mode_energies = staticmethod(jit(vmap(FluidSTRATOS._mode_energies, in_axes=(0, None))))
+    _batch_mode_entropy = staticmethod(jit(vmap(FluidSTRATOS._mode_entropy)))
+    _batch_coherence = staticmethod(jit(vmap(FluidSTRATOS._coherence)))
+
+    def measure_mode_energies(self):
+        """
+        Kötegelt mód energiák: (B, 16)
+        """
+        return np.asarray(self._batch_mode_energies(self.ψ, self._mode_weights))
+
+    def coherence(self):
+        """
+        Kötegelt koherencia: (B,)
+        """
+        return np.asarray(self._batch_coherence(self.ψ))
+
+    def get_state_metrics(self):
+        """
+        Kötegelt állapotlekérés az RL ágenseknek
+        Return: (brain_energy (B,), entropy (B,))
+        """
+        energies = self._batch_mode_energies(self.ψ, self._mode_weights)
+        entropy = self._batch_mode_entropy(energies)
+        return np.asarray(energies[:, 0]), np.asarray(entropy)
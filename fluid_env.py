@@ -0,0 +1,251 @@
+"""
+FLUID ENV - Tisztán funkcionális tanulókörnyezet
+A gát/csatorna szabályozási feladat reset/step függvényekként, így egész
+epizódok (és teljes tréningek) lax.scan-nel egyetlen programmá fordíthatók
+"""
+import time
+
+import numpy as np
+import jax
+import jax.numpy as jnp
+from jax import jit, lax, vmap
+
+from fluid_stratos import FluidSTRATOS
+from rl_gardener import RLGardener, ACTIONS, MAX_CHANNEL_DEPTH, shaped_reward
+
+# Akció hatások (mint train_gardener-ben)
+BARRIER_STEP = 0.2
+BARRIER_RANGE = (0.0, 2.5)
+CHANNEL_STEP = 2.0
+
+
+class FluidEnv:
+    """
+    A train_gardener feladata mellékhatás nélkül:
+        reset(key) -> (state, obs)
+        step(state, action) -> (state, obs, reward)
+
+    state: dict (ψ, gát, csatorna, viszkozitás) - JAX pytree, vmap-olható
+    obs:   [brain_energy, entropy, viscosity]
+    action: egész ID az RLGardener.actions sorrendjében
+    """
+
+    def __init__(self,
+                 grid_size=(64, 64),
+                 domain_size=20.0,
+                 steps_per_action=10,
+                 target_brain_energy=0.25,
+                 viscosity_range=(0.0, 1.0),
+                 actions=None,
+                 integrator='strang',
+                 precision='float32'):
+
+        # Rács, módok, statikus tájkép és kezdeti ψ egy sablon rendszerből
+        self.base = FluidSTRATOS(grid_size=grid_size, domain_size=domain_size,
+                                 integrator=integrator, precision=precision)
+        self.real_dtype = self.base.real_dtype
+        self.steps_per_action = steps_per_action  # Fizikai lépések egy döntés között
+        self.target = target_brain_energy
+        self.viscosity_range = viscosity_range  # reset() ebből sorsol (sweep-hez: (v, v))
+        self.actions = tuple(ACTIONS if actions is None else actions)
+        self._action_ids = {name: i for i, name in enumerate(self.actions)}
+
+        # Gát a Brain körül, csatorna Intuition <==> Logic (mélység 0-ról indul)
+        pos1 = self.base.get_mode_position("Intuition")
+        pos2 = self.base.get_mode_position("Logic")
+        self._channel_ends = jnp.asarray([*pos1, *pos2], dtype=self.real_dtype)
+
+    def reset(self, key):
+        """Új epizód: véletlen viszkozitás (környezeti tényező), kezdeti gát és ψ"""
+        viscosity = jax.random.uniform(key, dtype=self.real_dtype,
+                                       minval=self.viscosity_range[0], maxval=self.viscosity_range[1])
+        state = {
+            'psi': self.base.ψ,
+            'barrier': jnp.asarray(0.5, dtype=self.real_dtype),
+            'channel': jnp.asarray(0.0, dtype=self.real_dtype),
+            'viscosity': viscosity,
+        }
+        return state, self._observe(state)
+
+    def step(self, state, action):
+        """Akció alkalmazása, steps_per_action fizikai lépés, majd mérés és jutalom"""
+        action_is = lambda name: action == self._action_ids.get(name, -1)
+
+        barrier = state['barrier'] + jnp.where(action_is("RAISE_BARRIER"), BARRIER_STEP, 0.0) \
+                                   - jnp.where(action_is("LOWER_BARRIER"), BARRIER_STEP, 0.0)
+        barrier = jnp.clip(barrier, *BARRIER_RANGE).astype(self.real_dtype)
+        channel = jnp.where(action_is("DEEPEN_CHANNEL"),
+                            jnp.minimum(state['channel'] + CHANNEL_STEP, MAX_CHANNEL_DEPTH),
+                            state['channel'])
+
+        # Tájkép a paramétertáblákból, viszkozitás a kinetikus rúgásokban
+        V = FluidSTRATOS._synthesize_potential(
+            *self.base._landscape_dev,
+            jnp.stack([0.0, 0.0, barrier, 2.0])[None].astype(self.real_dtype),
+            jnp.concatenate([self._channel_ends, channel[None]])[None]
+        )
+        kinetic_scale = 1.0 - 0.9 * state['viscosity']
+        kinetic_ops = FluidSTRATOS._kinetic_ops(self.base.K2, self.base.dt, kinetic_scale,
+                                                self.base._coeffs())
+
+        psi = FluidSTRATOS._split_steps(state['psi'], V, self.base.g, self.base.dt, kinetic_ops,
+                                        self.base.gamma, self.steps_per_action, self.base._coeffs())
+        psi = FluidSTRATOS._normalize(psi, self.base.dx).astype(state['psi'].dtype)
+
+        state = dict(state, psi=psi, barrier=barrier, channel=channel)
+        obs = self._observe(state)
+        return state, obs, shaped_reward(obs[0], obs[1], self.target)
+
+    def _observe(self, state):
+        energies = FluidSTRATOS._mode_energies(state['psi'], self.base._mode_weights)
+        entropy = FluidSTRATOS._mode_entropy(energies)
+        return jnp.stack([energies[0], entropy, state['viscosity']])
+
+    def training_program(self, episodes, steps_per_episode, batch_size=1):
+        """
+        Teljes Q-learning tréning egyetlen fordított programként:
+        epizódok és lépések lax.scan-nel, batch_size párhuzamos környezet vmap-pel.
+        Return: jit-elt f(q_table, key, alpha, gamma, epsilon, energy_bins, viscosity_bins)
+                -> (q_table, visits (állapot × akció látogatásszám), returns (episodes, batch_size))
+        """
+        def state_index(obs, energy_bins, viscosity_bins):
+            return RLGardener.state_index(obs[:, 0], obs[:, 2], energy_bins, viscosity_bins)
+
+        def episode(q, visits, key, alpha, gamma, epsilon, energy_bins, viscosity_bins):
+            reset_key, key = jax.random.split(key)
+            state, obs = vmap(self.reset)(jax.random.split(reset_key, batch_size))
+
+            def step(carry, key):
+                q, visits, state, obs = carry
+                s = state_index(obs, energy_bins, viscosity_bins)
+                a = RLGardener.epsilon_greedy(q, s, key, epsilon)
+                state, obs, r = vmap(self.step)(state, a)
+                q = RLGardener.q_update(q, s, a, r, state_index(obs, energy_bins, viscosity_bins),
+                                        alpha, gamma)
+                return (q, visits.at[s, a].add(1), state, obs), r
+
+            (q, visits, _, _), rewards = lax.scan(step, (q, visits, state, obs),
+                                                  jax.random.split(key, steps_per_episode))
+            return (q, visits), jnp.sum(rewards, axis=0)
+
+        @jit
+        def train(q, key, alpha, gamma, epsilon, energy_bins, viscosity_bins):
+            run = lambda carry, key: episode(*carry, key, alpha, gamma, epsilon,
+                                             energy_bins, viscosity_bins)
+            visits = jnp.zeros(q.shape, dtype=jnp.int32)
+            (q, visits), returns = lax.scan(run, (q, visits), jax.random.split(key, episodes))
+            return q, visits, returns
+
+        return train
+
+
+class FluidVecEnv:
+    """
+    Gym-stílusú vektor környezet N párhuzamos mezővel (külső RL algoritmusokhoz)
+        reset(seed) -> obs (N, 3)
+        step(actions) -> (obs, rewards, dones, infos)
+        step_async(actions) / step_wait() - a fizika a háttérben fut, amíg az ágens számol
+
+    A fizika és a mérés egy vmap-olt, fordított hívás. max_episode_steps után a tag
+    automatikusan újraindul; ilyenkor obs már az új epizódé, a záró megfigyelés
+    infos['final_obs']-ban van.
+    """
+
+    def __init__(self, num_envs, max_episode_steps=50, seed=0, **env_kwargs):
+        self.env = FluidEnv(**env_kwargs)
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+        self.actions = self.env.actions
+        self.num_actions = len(self.actions)
+        self.observation_shape = (3,)
+
+        self._key = jax.random.PRNGKey(seed)
+        self._reset_batch = jit(vmap(self.env.reset))
+        self._step_batch = jit(self._step_and_autoreset)
+        self._state = None
+        self._t = None
+        self._pending = None
+
+    def reset(self, seed=None):
+        """Minden tag újraindítása, Return: obs (N, 3)"""
+        if seed is not None:
+            self._key = jax.random.PRNGKey(seed)
+        self._key, key = jax.random.split(self._key)
+
+        self._state, obs = self._reset_batch(jax.random.split(key, self.num_envs))
+        self._t = jnp.zeros(self.num_envs, dtype=jnp.int32)
+        self._pending = None
+        return np.asarray(obs)
+
+    def _step_and_autoreset(self, state, t, key, actions):
+        """Egy lépés minden tagban, a lejárt epizódok cseréje friss állapotra"""
+        state, final_obs, reward = vmap(self.env.step)(state, actions)
+        t = t + 1
+        done = t >= self.max_episode_steps
+
+        fresh_state, fresh_obs = vmap(self.env.reset)(jax.random.split(key, self.num_envs))
+        pick = lambda fresh, old: jnp.where(done.reshape((-1,) + (1,) * (old.ndim - 1)), fresh, old)
+        state = jax.tree_util.tree_map(pick, fresh_state, state)
+
+        return state, jnp.where(done, 0, t), pick(fresh_obs, final_obs), reward, done, final_obs
+
+    def step_async(self, actions):
+        """
+        Lépés indítása: a JAX aszinkron dispatch miatt azonnal visszatér,
+        a fizika a háttérben fut, amíg step_wait() nem kéri az eredményt
+        """
+        if self._state is None:
+            raise ValueError("A környezetet előbb reset()-elni kell")
+        self._key, key = jax.random.split(self._key)
+        result = self._step_batch(self._state, self._t, key, jnp.asarray(actions, dtype=jnp.int32))
+        self._state, self._t = result[0], result[1]
+        self._pending = result[2:]
+
+    def step_wait(self):
+        """A step_async() eredménye: (obs, rewards, dones, infos) NumPy tömbökkel"""
+        if self._pending is None:
+            raise ValueError("Nincs folyamatban lévő lépés (step_async hiányzik)")
+        obs, reward, done, final_obs = (np.asarray(x) for x in self._pending)
+        self._pending = None
+        return obs, reward, done, {'final_obs': final_obs}
+
+    def step(self, actions):
+        """Szinkron lépés: step_async + step_wait"""
+        self.step_async(actions)
+        return self.step_wait()
+
+
+def train_compiled(episodes=60, steps_per_episode=50, batch_size=1, seed=0,
+                   env=None, gardener=None):
+    """
+    train_gardener fordított megfelelője: reprodukálható (explicit PRNG kulcs),
+    és batch_size epizód fut egyszerre.
+    Return: (gardener, returns (episodes, batch_size), env lépés / mp)
+    """
+    env = FluidEnv() if env is None else env
+    gardener = RLGardener(actions=list(env.actions), seed=seed) if gardener is None else gardener
+    program = env.training_program(episodes, steps_per_episode, batch_size)
+
+    args = (gardener.alpha, gardener.gamma, gardener.epsilon,
+            gardener.energy_bins, gardener.viscosity_bins)
+
+    # Fordítás (a mért futásból kimarad)
+    program = program.lower(gardener.q_table, jax.random.PRNGKey(seed), *args).compile()
+
+    t0 = time.perf_counter()
+    q_table, _, returns = program(gardener.q_table, jax.random.PRNGKey(seed), *args)
+    q_table.block_until_ready()
+    seconds = time.perf_counter() - t0
+
+    gardener.q_table = q_table
+    steps_per_second = episodes * steps_per_episode * batch_size / seconds
+    return gardener, np.asarray(returns), steps_per_second
+
+
+if __name__ == "__main__":
+    print("🤖 Fordított Kertész Tréning...")
+    for batch_size in [1, 8]:
+        gardener, returns, sps = train_compiled(episodes=60, steps_per_episode=50, batch_size=batch_size)
+        print(f"   batch={batch_size}: átlag reward {returns.mean():.1f} "
+              f"(utolsó 10 epizód: {returns[-10:].mean():.1f}), {sps:.0f} env lépés/mp")
+    print("✅ Tréning kész.")
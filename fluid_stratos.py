@@ -2,11 +2,26 @@
 FLUID STRATOS - A Teljes Újragondolás
 """
 
+from functools import partial
+
 import numpy as np
+import jax
 import jax.numpy as jnp
-from jax import jit
+from jax import jit, lax
 import matplotlib.pyplot as plt
 
+from checkpoint import save_arrays, load_arrays
+from memory_index import MemoryIndex
+from trajectory import TrajectoryWriter
+
+# 4. rendű kompozíciós együtthatók (Yoshida 1990, Suzuki 1990)
+_YOSHIDA_W1 = 1 / (2 - 2**(1/3))
+_YOSHIDA_W0 = 1 - 2 * _YOSHIDA_W1
+_SUZUKI_P = 1 / (4 - 4**(1/3))
+
+# Gauss foltok levágása ennyi szórásnál (exp(-18) ≈ 1.5e-8 relatív hiba)
+_GAUSS_CUTOFF = 6.0
+
 class FluidSTRATOS:
     """
     STRATOS újragondolva folyékony rendszerként
@@ -15,10 +30,41 @@ class FluidSTRATOS:
     HANEM egyetlen kognitív mező különböző mintázatokkal
     """
     
+    # evolve(record_every=...) által a fordított ciklusban mérhető mennyiségek
+    OBSERVABLES = ('mode_energies', 'coherence', 'norm', 'entropy', 'brain_energy')
+    
+    # Lebegőpontos pontosság: név -> (valós, komplex) típus
+    PRECISIONS = {
+        'float32': (np.float32, np.complex64),
+        'float64': (np.float64, np.complex128),
+    }
+    
+    # Split-step sémák: név -> (rend, Strang al-lépések együtthatói)
+    # yoshida4 és forest_ruth ugyanaz a hármas ugrás (triple jump) kompozíció,
+    # suzuki4 az 5 fokozatú fraktál: több FFT, de kisebb hibaállandó
+    INTEGRATORS = {
+        'strang': (2, (1.0,)),
+        'yoshida4': (4, (_YOSHIDA_W1, _YOSHIDA_W0, _YOSHIDA_W1)),
+        'forest_ruth': (4, (_YOSHIDA_W1, _YOSHIDA_W0, _YOSHIDA_W1)),
+        'suzuki4': (4, (_SUZUKI_P, _SUZUKI_P, 1 - 4*_SUZUKI_P, _SUZUKI_P, _SUZUKI_P)),
+    }
+    
     def __init__(self, 
                  grid_size=(128, 128),  # 2D mező (gazdagabb!)
                  domain_size=20.0,
-                 n_modes=16):
+                 n_modes=16,
+                 integrator='strang',
+                 precision='float32'):
+        
+        if integrator not in self.INTEGRATORS:
+            raise ValueError(f"Ismeretlen integrátor: {integrator} (választható: {list(self.INTEGRATORS)})")
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Ismeretlen pontosság: {precision} (választható: {list(self.PRECISIONS)})")
+        
+        # Pontosság: minden rács, potenciál és ψ ezzel a típussal épül
+        self._check_precision(precision)
+        self.precision = precision
+        self.real_dtype, self.complex_dtype = self.PRECISIONS[precision]
         
         # ═══ A MEZŐ ═══
         self.Nx, self.Ny = grid_size
@@ -26,24 +72,29 @@ class FluidSTRATOS:
         self.dx = domain_size / grid_size[0]
         
         # 2D térháló
-        x = np.linspace(-self.L/2, self.L/2, self.Nx)
-        y = np.linspace(-self.L/2, self.L/2, self.Ny)
+        x = np.linspace(-self.L/2, self.L/2, self.Nx, dtype=self.real_dtype)
+        y = np.linspace(-self.L/2, self.L/2, self.Ny, dtype=self.real_dtype)
         self.X, self.Y = np.meshgrid(x, y)
         
         # Impulzus tér (FFT-hez)
         kx = 2*np.pi*np.fft.fftfreq(self.Nx, self.dx)
         ky = 2*np.pi*np.fft.fftfreq(self.Ny, self.dx)
         self.KX, self.KY = np.meshgrid(kx, ky)
-        self.K2 = self.KX**2 + self.KY**2
+        # ψ, V és K2 az eszközön (JAX) él, NumPy-ba csak megjelenítéskor kerül
+        self.K2 = jnp.asarray(self.KX**2 + self.KY**2, dtype=self.real_dtype)
         
         # KOGNITÍV HULLÁMFÜGGVÉNY
-        self.ψ = self._initialize_field()
+        self.ψ = jnp.asarray(self._initialize_field(), dtype=self.complex_dtype)
         
         # Potenciál (16 módos tájkép)
         self.V_static = self._create_16mode_landscape()
-        # Barrier management: dict of {id: V_field}
+        # Eszközoldali rács és statikus tájkép a potenciál-szintézishez
+        self._landscape_dev = tuple(jnp.asarray(a, dtype=self.real_dtype)
+                                    for a in (self.V_static, self.X, self.Y))
+        # Tájkép paramétertáblák (teljes rácsok helyett):
+        # gátak {id: (x0, y0, strength, width)}, csatornák {id: (x1, y1, x2, y2, depth)}
         self.active_barriers = {} 
-        self.V_coupling = np.zeros_like(self.V_static)
+        self.active_couplings = {}
         self._update_total_potential()
         
         # Fizika paraméterek
@@ -51,6 +102,12 @@ class FluidSTRATOS:
         self.dt = 0.01     # Időlépés
         self.gamma = 0.01  # Csillapítás (felejtés)
         self.kinetic_scale = 1.0 # Viszkozitás inverze (1.0 = szuperfolyékony)
+        self.integrator = integrator # Split-step séma, lásd INTEGRATORS
+        
+        # Kinetikus propagátor gyorsítótár, kulcs: (dt, kinetic_scale, integrator)
+        self._kinetic_key = None
+        self._kinetic_cache = None
+        self._adaptive_dt = None  # Az utolsó evolve_to() által elfogadott lépésköz
         
         # Hope Genome nevek
         self.mode_names = [
@@ -62,11 +119,28 @@ class FluidSTRATOS:
 
         # ═══ 16 ÁLLÓHULLÁM MÓD ═══
         self.modes = self._define_standing_wave_modes()
+        self._mode_index = {m['name']: i for i, m in enumerate(self.modes)}
+        # Előre számolt Gauss súlymátrix (16, Nx·Ny) a mód energiákhoz
+        self._mode_weights = self._build_mode_weights()
         
         # ═══ ÁLLAPOT ═══
         self.time = 0.0
         self.history = []
+        
+        # EmotiMem katalógus: minden tárolt csomag metaadata, térbeli indexszel
+        self.memories = MemoryIndex(domain_size)
     
+    @staticmethod
+    def _check_precision(precision):
+        """
+        float64-hez a JAX x64 módja kell. Ez folyamat szintű és nem vonható
+        vissza, ezért nem itt kapcsoljuk be, hanem indításkor kell megadni.
+        """
+        if precision == 'float64' and not jax.config.read('jax_enable_x64'):
+            raise ValueError("precision='float64' a JAX x64 módját igényli: indításkor állítsd be "
+                             "a JAX_ENABLE_X64=1 környezeti változót (vagy jax.config.update("
+                             "'jax_enable_x64', True) minden JAX számolás előtt)")
+
     def _initialize_field(self):
         """
         Kezdeti hullámfüggvény: 2D Gauss csomag
@@ -94,66 +168,252 @@ class FluidSTRATOS:
         
         return V
     
-    def add_coupling(self, mode_name1, mode_name2, strength=1.0):
+    def add_coupling(self, mode_name1, mode_name2, strength=1.0, coupling_id=None):
         """
         Tájkép-formálás: Csatorna nyitása két mód között
         Ez csökkenti a potenciálgátat, engedve az áramlást.
+        Meglévő ID esetén a mélység hozzáadódik (egyetlen tárolt csatorna marad).
         """
-        idx1 = next((i for i, m in enumerate(self.modes) if m['name'] == mode_name1), None)
-        idx2 = next((i for i, m in enumerate(self.modes) if m['name'] == mode_name2), None)
+        if coupling_id is None:
+            coupling_id = f"coupling_{mode_name1}_{mode_name2}"
         
-        if idx1 is None or idx2 is None:
-            print(f"⚠️ Hiba: Nem található mód ({mode_name1} vagy {mode_name2})")
+        params = self._coupling_params(mode_name1, mode_name2, strength)
+        if params is None:
             return
-            
-        pos1 = self.modes[idx1]['position']
-        pos2 = self.modes[idx2]['position']
         
-        # Vonal mentén Gauss-csatorna (negatív potenciál)
-        # Parametrikus vonal: p = (1-t)*p1 + t*p2
-        # De egyszerűbb egy hosszúkás Gauss-t ráilleszteni
+        old = self.active_couplings.get(coupling_id)
+        if old is not None:
+            params = params[:4] + (params[4] + old[4],)
+        self._set_landscape_entry(self.active_couplings, coupling_id, params, self._channel_patch)
+        print(f"🔗 Kapcsolat létrehozva: {mode_name1} <==> {mode_name2} (erősség: {strength})")
+
+    def set_coupling(self, mode_name1, mode_name2, strength=1.0, coupling_id=None):
+        """
+        Csatorna beállítása (előző felülírása) - a szabályozók minden lépésben
+        hangolhatják, a költség csak a csatorna foltjával arányos
+        """
+        if coupling_id is None:
+            coupling_id = f"coupling_{mode_name1}_{mode_name2}"
+        
+        params = self._coupling_params(mode_name1, mode_name2, strength)
+        if params is None:
+            return
         
-        mid_x = (pos1[0] + pos2[0]) / 2
-        mid_y = (pos1[1] + pos2[1]) / 2
+        self._set_landscape_entry(self.active_couplings, coupling_id, params, self._channel_patch)
+        print(f"🔗 Kapcsolat beállítva: ID={coupling_id}, {mode_name1} <==> {mode_name2} (mélység: {strength})")
+
+    def remove_coupling(self, coupling_id):
+        """Csatorna törlése ID alapján"""
+        if coupling_id not in self.active_couplings:
+            print(f"⚠️ Hiba: Nem található kapcsolat ({coupling_id})")
+            return
         
-        dx = pos2[0] - pos1[0]
-        dy = pos2[1] - pos1[1]
-        length = np.sqrt(dx**2 + dy**2)
-        angle = np.arctan2(dy, dx)
+        self._set_landscape_entry(self.active_couplings, coupling_id, None, self._channel_patch)
+        print(f"✂️ Kapcsolat törölve: ID={coupling_id}")
+
+    def _coupling_params(self, mode_name1, mode_name2, strength):
+        """Csatorna paramétersor (x1, y1, x2, y2, depth) két mód között, vagy None"""
+        pos1 = self.get_mode_position(mode_name1)
+        pos2 = self.get_mode_position(mode_name2)
         
-        # Forgatott koordináták a csatorna középpontjához képest
-        X_rot = (self.X - mid_x) * np.cos(angle) + (self.Y - mid_y) * np.sin(angle)
-        Y_rot = -(self.X - mid_x) * np.sin(angle) + (self.Y - mid_y) * np.cos(angle)
+        if pos1 is None or pos2 is None:
+            print(f"⚠️ Hiba: Nem található mód ({mode_name1} vagy {mode_name2})")
+            return None
         
-        # Csatorna potenciál: hosszú a hossztengely mentén, keskeny keresztben
-        channel_V = -strength * np.exp(-(X_rot**2/(length**2) + Y_rot**2/0.5))
+        # Vonal mentén Gauss-csatorna (negatív potenciál), a két végponttal paraméterezve
+        return (float(pos1[0]), float(pos1[1]), float(pos2[0]), float(pos2[1]), float(strength))
+
+    def _set_landscape_entry(self, table, key, params, patch_fn):
+        """
+        Paramétersor cseréje/törlése (params=None) egy táblában:
+        a régi foltot kivonjuk, az újat hozzáadjuk
+        """
+        old = table.get(key)
+        if params is None:
+            del table[key]
+            new = None
+        else:
+            table[key] = params
+            new = patch_fn(params)
+        
+        if old is not None:
+            old_box, old_patch = patch_fn(old)
+            if new is not None and new[0] == old_box:
+                # Azonos hordozó (tipikus szabályozási eset): egyetlen delta
+                new = (old_box, new[1] - old_patch)
+            else:
+                self._apply_delta(old_box, -old_patch)
+        if new is not None:
+            self._apply_delta(*new)
+
+    @staticmethod
+    def _barrier_field(X, Y, params, xp=np):
+        """Gauss-gát értéke az X, Y pontokon; params = (x0, y0, strength, width)"""
+        x0, y0, strength, width = params
+        return strength * xp.exp(-((X - x0)**2 + (Y - y0)**2) / (2 * width**2))
+
+    @staticmethod
+    def _channel_field(X, Y, params, xp=np):
+        """
+        Csatorna értéke az X, Y pontokon; params = (x1, y1, x2, y2, depth)
+        Hosszú a hossztengely mentén, keskeny keresztben
+        """
+        x1, y1, x2, y2, depth = params
+        length = xp.hypot(x2 - x1, y2 - y1)
+        ux, uy = (x2 - x1) / length, (y2 - y1) / length
         
-        self.V_coupling += channel_V
-        self._update_total_potential()
-        print(f"🔗 Kapcsolat létrehozva: {mode_name1} <==> {mode_name2} (erősség: {strength})")
+        # Forgatott koordináták a csatorna középpontjához képest
+        Xc, Yc = X - (x1 + x2) / 2, Y - (y1 + y2) / 2
+        X_rot = Xc * ux + Yc * uy
+        Y_rot = -Xc * uy + Yc * ux
+        
+        return -depth * xp.exp(-(X_rot**2/(length**2) + Y_rot**2/0.5))
+
+    @staticmethod
+    @jit
+    def _synthesize_potential(V_static, X, Y, barriers, channels):
+        """
+        Teljes V a paramétertáblákból egyetlen vektorizált kernelben
+        barriers: (n, 4), channels: (m, 5) - V differenciálható ezek szerint
+        """
+        X, Y = X[None], Y[None]
+        V = V_static + jnp.sum(
+            FluidSTRATOS._barrier_field(X, Y, barriers.T[:, :, None, None], jnp), axis=0)
+        return V + jnp.sum(
+            FluidSTRATOS._channel_field(X, Y, channels.T[:, :, None, None], jnp), axis=0)
+
+    def landscape_params(self):
+        """
+        A tájkép paramétertáblái NumPy tömbként
+        Return: (barriers (n, 4): x0, y0, strength, width;
+                 channels (m, 5): x1, y1, x2, y2, depth)
+        """
+        barriers = np.array(list(self.active_barriers.values()), dtype=float).reshape(-1, 4)
+        channels = np.array(list(self.active_couplings.values()), dtype=float).reshape(-1, 5)
+        return barriers, channels
+
+    def synthesize_potential(self, barriers=None, channels=None):
+        """
+        V az eszközön a megadott (vagy az aktuális) paramétertáblákból
+        JAX transzformációkkal (grad, vmap) együtt használható
+        """
+        if barriers is None or channels is None:
+            current = self.landscape_params()
+            barriers = current[0] if barriers is None else barriers
+            channels = current[1] if channels is None else channels
+        
+        return self._synthesize_potential(
+            *self._landscape_dev,
+            jnp.asarray(barriers, dtype=self.real_dtype),
+            jnp.asarray(channels, dtype=self.real_dtype)
+        )
 
     def _update_total_potential(self):
-        """Összegzi a potenciál komponenseket"""
-        V_barriers_total = np.zeros_like(self.V_static)
-        for b in self.active_barriers.values():
-            V_barriers_total += b
-            
-        self.V = self.V_static + V_barriers_total + self.V_coupling
+        """
+        Teljes újraszintézis a paramétertáblákból (inicializáláskor).
+        A futó összeg host-on float64-ben él, a gát/csatorna módosítások
+        ezután csak deltákat írnak (_apply_delta).
+        """
+        self._V_dev = self.synthesize_potential()
+        self._V_view = None
+        self._V_total = np.array(self._V_dev, dtype=np.float64)
+
+    @property
+    def V(self):
+        """
+        A teljes potenciál (eszközoldali tömb)
+        A belső puffert (_V_dev) a gát/csatorna módosítások helyben írják felül,
+        ezért kifelé egy másolat megy, amely a következő módosításig gyorsítótárazott:
+        egy korábban elkért V a későbbi módosítások után is érvényes marad.
+        """
+        if self._V_view is None:
+            self._V_view = jnp.array(self._V_dev, copy=True)
+        return self._V_view
+
+    @V.setter
+    def V(self, value):
+        """Közvetlen felülírás: a futó float64 összeg is ehhez igazodik"""
+        self._V_total = np.array(value, dtype=np.float64)
+        self._V_dev = jnp.array(value, dtype=self.real_dtype, copy=True)
+        self._V_view = None
+
+    def _gaussian_box(self, x0, y0, rx, ry):
+        """
+        Rácsindex-tartomány (iy0, iy1, ix0, ix1), amely lefedi az (x0, y0)
+        körüli rx × ry félszélességű téglalapot (_GAUSS_CUTOFF szórásig)
+        """
+        x = self.X[0]
+        y = self.Y[:, 0]
+        ix0 = np.searchsorted(x, x0 - _GAUSS_CUTOFF * rx)
+        ix1 = np.searchsorted(x, x0 + _GAUSS_CUTOFF * rx, side='right')
+        iy0 = np.searchsorted(y, y0 - _GAUSS_CUTOFF * ry)
+        iy1 = np.searchsorted(y, y0 + _GAUSS_CUTOFF * ry, side='right')
+        return (int(iy0), int(iy1), int(ix0), int(ix1))
+
+    @staticmethod
+    def _box_slices(box):
+        iy0, iy1, ix0, ix1 = box
+        return (slice(iy0, iy1), slice(ix0, ix1))
+
+    def _box_coords(self, box):
+        """A téglalapra eső X, Y rácsrészlet (float64, a futó összeg pontosságán)"""
+        sl = self._box_slices(box)
+        return self.X[sl].astype(np.float64), self.Y[sl].astype(np.float64)
+
+    def _barrier_patch(self, params):
+        """Gát a hordozójára vágva: (box, patch)"""
+        x0, y0, _, width = params
+        box = self._gaussian_box(x0, y0, width, width)
+        return box, self._barrier_field(*self._box_coords(box), params)
+
+    def _channel_patch(self, params):
+        """Csatorna az elforgatott ellipszis befoglaló téglalapjára vágva: (box, patch)"""
+        x1, y1, x2, y2, _ = params
+        length = np.hypot(x2 - x1, y2 - y1)
+        angle = np.arctan2(y2 - y1, x2 - x1)
+        
+        # Elforgatott Gauss x/y irányú szórása (hossz: length/√2, kereszt: 0.5)
+        sigma_long, sigma_short = length / np.sqrt(2), 0.5
+        rx = np.hypot(sigma_long * np.cos(angle), sigma_short * np.sin(angle))
+        ry = np.hypot(sigma_long * np.sin(angle), sigma_short * np.cos(angle))
+        
+        box = self._gaussian_box((x1 + x2) / 2, (y1 + y2) / 2, rx, ry)
+        return box, self._channel_field(*self._box_coords(box), params)
+
+    @staticmethod
+    @partial(jit, donate_argnums=0)
+    def _write_region(V, patch, iy0, ix0):
+        """Eszközoldali V egy téglalapjának felülírása (a régi puffer újrahasznosítva, csak _V_dev-re)"""
+        return lax.dynamic_update_slice(V, patch, (iy0, ix0))
+
+    def _apply_delta(self, box, delta):
+        """
+        Delta hozzáadása a futó összeghez, és csak az érintett téglalap szinkronizálása
+        az eszközre - a költség a folt méretével, nem a rács méretével skálázódik
+        """
+        iy0, iy1, ix0, ix1 = box
+        if iy1 <= iy0 or ix1 <= ix0:
+            return
+        
+        sl = self._box_slices(box)
+        self._V_total[sl] += delta
+        patch = jnp.asarray(self._V_total[sl], dtype=self.real_dtype)
+        self._V_dev = self._write_region(self._V_dev, patch, iy0, ix0)
+        self._V_view = None
 
     def add_barrier(self, position, strength=0.5, width=1.0, barrier_id=None):
         """
         Lokális gát építése (pl. a Brain köré)
         barrier_id: egyedi azonosító a későbbi módosításhoz
+        Meglévő ID esetén a régi gátat kivonjuk, az újat hozzáadjuk (csak a foltokon).
         """
         x0, y0 = position
         if barrier_id is None:
             barrier_id = f"barrier_{x0}_{y0}"
         
-        # Pozitív Gauss-potenciál
-        barrier = strength * np.exp(-((self.X-x0)**2 + (self.Y-y0)**2)/(2*width**2))
-        
-        self.active_barriers[barrier_id] = barrier
-        self._update_total_potential()
+        # Pozitív Gauss-potenciál, csak a paraméterei tárolódnak
+        params = (float(x0), float(y0), float(strength), float(width))
+        self._set_landscape_entry(self.active_barriers, barrier_id, params, self._barrier_patch)
         print(f"🛡️ Gát építve: ID={barrier_id}, pos={position}, H={strength}, W={width}")
 
     def set_barrier(self, position, strength=0.5, width=1.0, barrier_id=None):
@@ -165,10 +425,8 @@ class FluidSTRATOS:
 
     def get_mode_position(self, mode_name):
         """Segédfüggvény pozíció lekéréshez"""
-        for mode in self.modes:
-            if mode['name'] == mode_name:
-                return mode['position']
-        return None
+        idx = self._mode_index.get(mode_name)
+        return None if idx is None else self.modes[idx]['position']
 
     def _hexagonal_lattice(self, n, radius):
         """16 pont hatszög rácsban"""
@@ -190,12 +448,14 @@ class FluidSTRATOS:
         
         return positions[:n]
     
-    def _define_standing_wave_modes(self):
+    def _define_standing_wave_modes(self, positions=None):
         """
         16 állóhullám mód definíció
         Ezek NEM komponensek - MINTÁZATOK a mezőben!
+        positions: mód középpontok (alapértelmezés: hexagonális rács; betöltéskor a mentett)
         """
-        positions = self._hexagonal_lattice(16, 6.0)
+        if positions is None:
+            positions = self._hexagonal_lattice(16, 6.0)
         
         modes = []
         for i, (x0, y0) in enumerate(positions):
@@ -227,8 +487,7 @@ class FluidSTRATOS:
         ψ = jnp.fft.ifft2(ψ_k)
         
         # Teljes potential + nonlinear + damping
-        V_total = V + g * jnp.abs(ψ)**2
-        ψ = ψ * jnp.exp(-1j * dt * V_total - gamma * dt)
+        ψ = FluidSTRATOS._potential_step(ψ, V, g, dt, gamma)
         
         # Fél kinetic (skálázva)
         ψ_k = jnp.fft.fft2(ψ)
@@ -236,6 +495,180 @@ class FluidSTRATOS:
         ψ = jnp.fft.ifft2(ψ_k)
         
         return ψ
+
+    @staticmethod
+    @partial(jit, static_argnames=('coeffs',))
+    def _evolve_n(ψ, V, g, dt, kinetic_ops, gamma, steps, coeffs=(1.0,)):
+        """
+        N darab split-step lépés egyetlen XLA programban (lax.fori_loop)
+        steps futásidejű érték: eltérő lépésszám nem fordít újra
+        """
+        return FluidSTRATOS._split_steps(ψ, V, g, dt, kinetic_ops, gamma, steps, coeffs)
+
+    @staticmethod
+    def _split_steps(ψ, V, g, dt, kinetic_ops, gamma, steps, coeffs=(1.0,)):
+        """
+        A fúzionált split-step ciklus (fordítatlan, más kernelekbe ágyazható)
+        Python int steps esetén a fori_loop scan-né fordul, így visszafelé is deriválható.
+
+        Egy lépés a coeffs szerinti Strang al-lépések kompozíciója (INTEGRATORS).
+        Strang-fúzió: az egymást követő fél-kinetikus rúgások (al-lépések és
+        lépések határán is) egyetlen rúgássá olvadnak, így al-lépésenként
+        egy FFT pár fut.
+        kinetic_ops: a _kinetic_ops által adott [nyitó fél rúgás, d_1, ..., d_s]
+        """
+        def body(_, ψ_k):
+            for i, c in enumerate(coeffs):
+                ψ = jnp.fft.ifft2(ψ_k)
+                ψ = FluidSTRATOS._potential_step(ψ, V, g, c * dt, gamma)
+                ψ_k = jnp.fft.fft2(ψ) * kinetic_ops[i + 1]
+            return ψ_k
+
+        # A ciklusváltozó típusa nem változhat: valós kezdőállapotot komplexre emelünk
+        ψ = ψ.astype(jnp.result_type(ψ, jnp.complex64))
+
+        # Nyitó fél rúgás, majd a ciklus a következő lépés nyitó rúgásával zár
+        ψ_k = jnp.fft.fft2(ψ) * kinetic_ops[0]
+        ψ_k = lax.fori_loop(0, steps, body, ψ_k)
+
+        # Az utolsó összevont rúgásból a nyitó részt visszavonjuk (|kinetic_ops| = 1)
+        return jnp.fft.ifft2(ψ_k * jnp.conj(kinetic_ops[0]))
+
+    @staticmethod
+    def _potential_step(ψ, V, g, dt, gamma):
+        """
+        Potenciál + nemlineáris + csillapítás al-lépés egzakt megoldása
+        Csillapítás mellett |ψ|² ~ e^(-2γt), így a nemlineáris fázis
+        g|ψ|²·(1 - e^(-2γdt))/(2γ); γ → 0 esetén g|ψ|²·dt.
+        (A g|ψ|²·dt közelítés O(γ dt²) hibája elsőrendűvé rontaná a magasabb rendű sémákat.)
+        """
+        safe_gamma = jnp.where(gamma == 0, 1.0, gamma)
+        t_nl = jnp.where(gamma == 0, dt, -jnp.expm1(-2 * safe_gamma * dt) / (2 * safe_gamma))
+        return ψ * jnp.exp(-1j * (V * dt + g * jnp.abs(ψ)**2 * t_nl) - gamma * dt)
+
+    @staticmethod
+    def _kinetic_ops(K2, dt, kinetic_scale, coeffs=(1.0,)):
+        """
+        Összevont kinetikus rúgások egy séma fúzionált lépéséhez
+        Drift hányadok: c_1/2, (c_1+c_2)/2, ..., (c_s+c_1)/2  (Strang: 1/2, 1)
+        """
+        drifts = [coeffs[0] / 2]
+        drifts += [(c + c_next) / 2 for c, c_next in zip(coeffs, coeffs[1:] + coeffs[:1])]
+        return jnp.stack([jnp.exp(-1j * a * dt * K2 * kinetic_scale / 2) for a in drifts])
+
+    def _kinetic_propagator(self):
+        """
+        Kinetikus rúgások, csak (dt, kinetic_scale, integrator) változásakor számolódnak újra
+        """
+        key = (self.dt, self.kinetic_scale, self.integrator)
+        if self._kinetic_key != key:
+            self._kinetic_cache = self._kinetic_ops(self.K2, self.dt, self.kinetic_scale, self._coeffs())
+            self._kinetic_key = key
+        return self._kinetic_cache
+
+    def _coeffs(self):
+        """Az aktuális integrátor al-lépés együtthatói"""
+        return self.INTEGRATORS[self.integrator][1]
+
+    @staticmethod
+    def _composed_step(ψ, V, g, dt, K2, gamma, kinetic_scale, coeffs=(1.0,)):
+        """Egyetlen (nem fúzionált) lépés a coeffs séma szerint"""
+        for c in coeffs:
+            ψ = FluidSTRATOS._gpe_step_2d(ψ, V, g, c * dt, K2, gamma, kinetic_scale)
+        return ψ
+
+    @staticmethod
+    @partial(jit, static_argnames=('n_records', 'observables', 'coeffs', 'renormalize'))
+    def _evolve_recorded(ψ, V, g, dt, kinetic_ops, gamma, weights, dx,
+                         record_every, n_records, observables, coeffs=(1.0,), renormalize=False):
+        """
+        n_records × record_every lépés lax.scan-nel, minden blokk végén mérve
+        A mérések az eszközön gyűlnek: (n_records, ...) tömbök névenként
+
+        A mérés a normált másolaton történik, a ciklus a normálatlan ψ-t viszi
+        tovább: a trajektória ugyanaz, mint mérés nélkül. renormalize=True esetén
+        minden blokk után normalizálunk, mintha evolve(record_every) hívások
+        sorozata futna ('norm' mindkét esetben a normalizálás előtti érték).
+        """
+        def chunk(ψ, _):
+            ψ = FluidSTRATOS._evolve_n(ψ, V, g, dt, kinetic_ops, gamma, record_every, coeffs)
+            record = FluidSTRATOS._observe(ψ, weights, dx, observables)
+            return (FluidSTRATOS._normalize(ψ, dx) if renormalize else ψ), record
+
+        ψ = ψ.astype(jnp.result_type(ψ, jnp.complex64))
+        return lax.scan(chunk, ψ, None, length=n_records)
+
+    @staticmethod
+    @partial(jit, static_argnames=('coeffs', 'order'))
+    def _evolve_adaptive(ψ, V, g, K2, gamma, kinetic_scale, dx, duration,
+                         dt0, dt_min, dt_max, tol, max_steps, coeffs=(1.0,), order=2):
+        """
+        Adaptív lépésköz lépésduplázással (step doubling)
+        Egy h lépést összevetünk két h/2 lépéssel; a különbség L2 normája a
+        lokális hibabecslés. Elfogadásnál a pontosabb (két fél lépéses) ψ marad.
+        Az idő a hívás kezdetétől számít (0 -> duration).
+        Return: (eltelt idő, ψ, h, elfogadott, elutasított)
+        """
+        def step(ψ, h):
+            return FluidSTRATOS._composed_step(ψ, V, g, h, K2, gamma, kinetic_scale, coeffs)
+
+        def cond(carry):
+            t, _, _, accepted, rejected = carry
+            return (t < duration) & (accepted + rejected < max_steps)
+
+        def body(carry):
+            t, ψ, h, accepted, rejected = carry
+            h_try = jnp.minimum(h, duration - t)
+
+            ψ_full = step(ψ, h_try)
+            ψ_half = step(step(ψ, h_try / 2), h_try / 2)
+            err = jnp.sqrt(jnp.sum(jnp.abs(ψ_half - ψ_full)**2) * dx**2)
+
+            # dt_min-nél nem tudunk tovább finomítani: elfogadjuk
+            accept = (err <= tol) | (h_try <= dt_min)
+
+            # p-edrendű séma: lokális hiba ~ h^(p+1)
+            factor = jnp.clip(0.9 * (tol / jnp.maximum(err, 1e-30))**(1 / (order + 1)), 0.3, 2.0)
+            h_new = jnp.clip(h_try * factor, dt_min, dt_max)
+            # A cél miatt levágott (elfogadott) utolsó lépés ne húzza le a következő
+            # javaslatot; egyébként elfogadás után is csökkenhet a lépésköz
+            h_new = jnp.where(accept & (h_try < h), jnp.maximum(h_new, jnp.minimum(h, dt_max)), h_new)
+
+            return (jnp.where(accept, t + h_try, t),
+                    jnp.where(accept, ψ_half, ψ),
+                    h_new,
+                    accepted + accept,
+                    rejected + (~accept))
+
+        ψ = ψ.astype(jnp.result_type(ψ, jnp.complex64))
+        zero = jnp.asarray(0)
+        init = (jnp.asarray(0.0, dtype=K2.dtype), ψ, jnp.asarray(dt0, dtype=K2.dtype), zero, zero)
+        return lax.while_loop(cond, body, init)
+
+    @staticmethod
+    def _observe(ψ, weights, dx, observables):
+        """
+        Megfigyelhetők egy (nem feltétlenül normált) ψ normált másolatán,
+        fordított kódon belül is hívható; 'norm' a normálás előtti érték
+        """
+        norm = jnp.sqrt(jnp.sum(jnp.abs(ψ)**2) * dx**2)
+        ψ = ψ / norm
+        energies = FluidSTRATOS._mode_energies(ψ, weights)
+        values = {
+            'mode_energies': lambda: energies,
+            'brain_energy': lambda: energies[0],
+            'entropy': lambda: FluidSTRATOS._mode_entropy(energies),
+            'coherence': lambda: FluidSTRATOS._coherence(ψ),
+            'norm': lambda: norm,
+        }
+        return {name: values[name]() for name in observables}
+
+    @staticmethod
+    @jit
+    def _normalize(ψ, dx):
+        """Normalizálás az eszközön: ∫|ψ|² dx dy = 1"""
+        norm = jnp.sqrt(jnp.sum(jnp.abs(ψ)**2) * dx**2)
+        return ψ / norm
     
     def set_viscosity(self, level):
         """
@@ -244,7 +677,8 @@ class FluidSTRATOS:
         """
         # Ha level=0 (flow), scale=1.0
         # Ha level=1 (ragad), scale=0.1
-        self.kinetic_scale = 1.0 - (0.9 * np.clip(level, 0.0, 1.0))
+        self.kinetic_scale = float(1.0 - (0.9 * np.clip(level, 0.0, 1.0)))
+        self._kinetic_key = None  # Propagátor érvénytelenítése
         print(f"💧 Viszkozitás beállítva: {level:.2f} (Kinetic Scale: {self.kinetic_scale:.2f})")
 
     def get_state_metrics(self):
@@ -252,49 +686,290 @@ class FluidSTRATOS:
         Állapotlekérés az RL ágensnek
         Return: (brain_energy, entropy)
         """
-        energies = self.measure_mode_energies()
-        brain_energy = energies[0] # Brain mode
+        energies = self._mode_energies(self.ψ, self._mode_weights)
+        brain_energy = float(energies[0]) # Brain mode
         
         # Shannon entrópia a 16 mód eloszlásán
-        # Normalizáljuk az eloszlást
-        p = energies / np.sum(energies)
-        p = p[p > 0] # 0 kivétele log miatt
-        entropy = -np.sum(p * np.log(p))
+        entropy = float(self._mode_entropy(energies))
         
         return brain_energy, entropy
 
-    def evolve(self, steps=100):
+    def evolve(self, steps=100, record_every=None, observables=('mode_energies',), trajectory=None,
+               renormalize=False):
         """
         Mező fejlődés
+
+        record_every: ha meg van adva, minden record_every. lépés után a fordított
+                      cikluson belül mérjük az observables-ben felsorolt mennyiségeket
+                      (lásd OBSERVABLES). Ekkor a visszatérési érték egy dict
+                      {'time': (n,), név: (n, ...)} NumPy tömbökkel. A mérés nem
+                      változtat a fejlődésen ('norm': a hívás eleje óta megmaradt norma).
+        renormalize: record_every mellett minden mérés után normalizálás (a mérés
+                     nélküli futástól eltérő, evolve(record_every) hívássorozatnak megfelelő fizika)
+        trajectory: trajectory_writer() által adott író - minden 'every'. lépés után
+                    egy képkocka kerül a háttérben lemezre (record_every-vel nem együtt)
         """
-        # Convert to JAX arrays once for the loop if possible, 
-        # but here we keep the user's structure (interleaving numpy/jax) 
-        # to test their exact logic first.
-        # However, to make it run smoothly with JAX JIT, we pass jax arrays.
-        
-        # Pre-convert constant fields to JAX arrays for efficiency
-        j_V = jnp.array(self.V)
-        j_K2 = jnp.array(self.K2)
-        
-        current_psi = jnp.array(self.ψ)
-        
-        for _ in range(steps):
-            current_psi = self._gpe_step_2d(
-                current_psi,
-                j_V,
+        if trajectory is not None:
+            if record_every is not None:
+                raise ValueError("record_every és trajectory nem használható együtt")
+            return self._evolve_streamed(steps, trajectory)
+
+        if record_every is None:
+            # ψ, V és K2 már JAX tömbök: nincs host <-> eszköz másolás
+            # Az összes lépés egyetlen fordított hívásban fut (nincs lépésenkénti dispatch)
+            current_psi = self._evolve_n(
+                self.ψ,
+                self._V_dev,
                 self.g,
                 self.dt,
-                j_K2,
+                self._kinetic_propagator(),
                 self.gamma,
-                self.kinetic_scale
+                steps,
+                self._coeffs()
             )
-            self.time += self.dt
+            self.time += steps * self.dt
             
-        self.ψ = np.array(current_psi) # Vissza numpy-ba
+            # Normalizálás
+            self.ψ = self._normalize(current_psi, self.dx)
+            return None
+
+        observables = self._check_observables(observables)
+        n_records = steps // record_every
+        current_psi, records = self._evolve_recorded(
+            self.ψ,
+            self._V_dev,
+            self.g,
+            self.dt,
+            self._kinetic_propagator(),
+            self.gamma,
+            self._mode_weights,
+            self.dx,
+            record_every,
+            n_records,
+            observables,
+            self._coeffs(),
+            renormalize
+        )
+        
+        # A maradék (nem mért) lépések
+        remainder = steps - n_records * record_every
+        if remainder:
+            current_psi = self._evolve_n(
+                current_psi, self._V_dev, self.g, self.dt,
+                self._kinetic_propagator(), self.gamma, remainder, self._coeffs()
+            )
         
-        # Normalizálás
-        norm = np.sqrt(np.sum(np.abs(self.ψ)**2) * self.dx**2)
-        self.ψ = self.ψ / norm
+        t0 = self.time
+        self.time += steps * self.dt
+        self.ψ = self._normalize(current_psi, self.dx)
+        
+        result = {'time': t0 + self.dt * record_every * np.arange(1, n_records + 1)}
+        result.update({name: np.asarray(value) for name, value in records.items()})
+        return result
+
+    # Képkocka mennyiségek a trajektória íráshoz
+    TRAJECTORY_QUANTITIES = ('density', 'psi')
+
+    def trajectory_writer(self, path, every=10, quantity='density', downsample=1,
+                          dtype='float16', queue_size=8, chunk_frames=32):
+        """
+        Trajektória író evolve(trajectory=...)-hoz (lásd trajectory.py)
+
+        every: képkocka ennyi lépésenként
+        quantity: 'density' (|ψ|², downsample × downsample blokk-átlaggal) vagy
+                  'psi' (minden downsample. rácspont; valós dtype esetén (..., 2) re/im)
+        dtype: tárolási típus (pl. 'float16' a méret feléért), a konverzió az eszközön fut
+        queue_size: legfeljebb ennyi képkocka várakozik a memóriában
+        Az olvasás: trajectory.TrajectoryReader(path)
+        """
+        if quantity not in self.TRAJECTORY_QUANTITIES:
+            raise ValueError(f"Ismeretlen mennyiség: {quantity} (választható: {self.TRAJECTORY_QUANTITIES})")
+        if self.Nx % downsample or self.Ny % downsample:
+            raise ValueError(f"A rács ({self.Nx}×{self.Ny}) nem osztható downsample={downsample}-mel")
+
+        frame_shape = (self.Ny // downsample, self.Nx // downsample)
+        if quantity == 'psi' and not np.issubdtype(np.dtype(dtype), np.complexfloating):
+            frame_shape += (2,)
+
+        meta = {'quantity': quantity, 'every': every, 'downsample': downsample,
+                'dt': self.dt, 'grid_size': [self.Nx, self.Ny], 'domain_size': self.L,
+                'extent': [float(self.X.min()), float(self.X.max()),
+                           float(self.Y.min()), float(self.Y.max())]}
+        return TrajectoryWriter(path, frame_shape, dtype, meta=meta,
+                                queue_size=queue_size, chunk_frames=chunk_frames)
+
+    def _evolve_streamed(self, steps, trajectory):
+        """
+        evolve() képkockák írásával: 'every' lépéses fordított szakaszok, mindegyik
+        után a képkocka az eszközön készül el, és a háttérszál írja ki - a szimuláció
+        közben tovább fut. A normalizálás (mint evolve-ban) csak a végén történik.
+        """
+        meta = trajectory.meta
+        every = meta['every']
+        frame_args = (meta['quantity'], meta['downsample'], trajectory.dtype.name)
+        args = lambda: (self._V_dev, self.g, self.dt, self._kinetic_propagator(), self.gamma)
+
+        current_psi = self.ψ
+        for _ in range(steps // every):
+            current_psi = self._evolve_n(current_psi, *args(), every, self._coeffs())
+            self.time += every * self.dt
+            trajectory.append(self._frame(current_psi, self.dx, *frame_args), self.time)
+
+        remainder = steps % every
+        if remainder:
+            current_psi = self._evolve_n(current_psi, *args(), remainder, self._coeffs())
+            self.time += remainder * self.dt
+
+        self.ψ = self._normalize(current_psi, self.dx)
+
+    @staticmethod
+    @partial(jit, static_argnames=('quantity', 'downsample', 'dtype'))
+    def _frame(ψ, dx, quantity, downsample, dtype):
+        """Egy képkocka a normált ψ-ből: sűrűség blokk-átlaggal vagy ritkított ψ"""
+        ψ = FluidSTRATOS._normalize(ψ, dx)
+        if quantity == 'density':
+            density = jnp.abs(ψ)**2
+            ny, nx = density.shape
+            density = density.reshape(ny // downsample, downsample, nx // downsample, downsample)
+            return density.mean(axis=(1, 3)).astype(dtype)
+
+        ψ = ψ[::downsample, ::downsample]
+        if jnp.issubdtype(dtype, jnp.complexfloating):
+            return ψ.astype(dtype)
+        return jnp.stack([ψ.real, ψ.imag], axis=-1).astype(dtype)
+
+    def _check_observables(self, observables):
+        """Megfigyelhető nevek ellenőrzése, statikus tuple-ként"""
+        observables = tuple(observables)
+        unknown = [name for name in observables if name not in self.OBSERVABLES]
+        if unknown:
+            raise ValueError(f"Ismeretlen megfigyelhető: {unknown} (választható: {self.OBSERVABLES})")
+        return observables
+
+    def get_params(self):
+        """
+        A differenciálható paraméterek pytree-je a simulate() számára
+        barriers (n, 4), channels (m, 5) - lásd landscape_params(),
+        valamint kinetic_scale (viszkozitás), g és gamma skalárok
+        """
+        barriers, channels = self.landscape_params()
+        params = {'barriers': barriers, 'channels': channels,
+                  'kinetic_scale': self.kinetic_scale, 'g': self.g, 'gamma': self.gamma}
+        return {name: jnp.asarray(value, dtype=self.real_dtype) for name, value in params.items()}
+
+    def simulate(self, params=None, psi0=None, steps=100, observables=('mode_energies',),
+                 record_every=None, checkpoint_every=None):
+        """
+        Funkcionális, végig differenciálható evolúció - a rendszer állapotát nem módosítja
+        jax.grad a params (get_params() alakú dict) és psi0 szerint is átmegy rajta.
+
+        Return: dict a végállapot megfigyelhetőivel és a normált 'psi'-vel;
+                record_every esetén a megfigyelhetők (n, ...) trajektóriák, mint evolve()-nál.
+        checkpoint_every: rematerializációs blokkméret (alapértelmezés ~√steps),
+                          a visszaterjesztés memóriája így ~2√steps mezőnyi marad.
+        """
+        params = self.get_params() if params is None else params
+        psi0 = self.ψ if psi0 is None else psi0
+        if checkpoint_every is None:
+            checkpoint_every = max(1, int(np.sqrt(record_every or steps)))
+        
+        return self._simulate(
+            params, psi0, self._landscape_dev, self.K2, self.dt, self._mode_weights, self.dx,
+            steps, checkpoint_every, record_every, self._check_observables(observables),
+            self._coeffs()
+        )
+
+    @staticmethod
+    @partial(jit, static_argnames=('steps', 'checkpoint_every', 'record_every',
+                                   'observables', 'coeffs'))
+    def _simulate(params, ψ, landscape, K2, dt, weights, dx, steps, checkpoint_every,
+                  record_every, observables, coeffs=(1.0,)):
+        """
+        A simulate() kernele: V és a kinetikus rúgások is a params-ból épülnek,
+        a lépésszámok statikusak (fori_loop -> scan, így visszafelé is deriválható)
+        """
+        V = FluidSTRATOS._synthesize_potential(*landscape, params['barriers'], params['channels'])
+        kinetic_ops = FluidSTRATOS._kinetic_ops(K2, dt, params['kinetic_scale'], coeffs)
+        g, gamma = params['g'], params['gamma']
+        
+        def evolve_n(ψ, n):
+            return FluidSTRATOS._split_steps(ψ, V, g, dt, kinetic_ops, gamma, n, coeffs)
+        
+        @jax.checkpoint
+        def block(ψ, _):
+            # Visszaterjesztéskor a blokk belső állapotai újraszámolódnak, csak a határok tárolódnak
+            return evolve_n(ψ, checkpoint_every), None
+        
+        def advance(ψ, n):
+            n_blocks, rest = divmod(n, checkpoint_every)
+            ψ, _ = lax.scan(block, ψ, None, length=n_blocks)
+            return evolve_n(ψ, rest) if rest else ψ
+        
+        ψ = ψ.astype(jnp.result_type(ψ, jnp.complex64))
+        if record_every is None:
+            ψ = advance(ψ, steps)
+            result = FluidSTRATOS._observe(ψ, weights, dx, observables)
+        else:
+            # Blokkonként mérünk a normált másolaton, mint evolve(record_every=...)
+            def chunk(ψ, _):
+                ψ = advance(ψ, record_every)
+                return ψ, FluidSTRATOS._observe(ψ, weights, dx, observables)
+            
+            n_records = steps // record_every
+            ψ, result = lax.scan(chunk, ψ, None, length=n_records)
+            ψ = advance(ψ, steps - n_records * record_every)
+        
+        result['psi'] = FluidSTRATOS._normalize(ψ, dx)
+        return result
+
+    def evolve_to(self, t_target, tol=1e-4, dt_min=1e-4, dt_max=0.1, max_steps=100000):
+        """
+        Mező fejlődés egy cél időpontig adaptív lépésközzel
+        
+        Csendes szakaszokban nagy, gerjesztés (excite_mode) után kicsi lépések.
+        tol: megengedett lokális hiba lépésenként (L2 norma)
+        max_steps: a próbált (elfogadott + elutasított) lépések felső korlátja;
+                   elérésekor a futás t_target előtt megáll ('reached': False)
+        Return: {'time', 'accepted', 'rejected', 'dt', 'reached'} statisztika
+        """
+        dt0 = self._adaptive_dt if self._adaptive_dt is not None else self.dt
+        duration = t_target - self.time
+        
+        t, current_psi, h, accepted, rejected = self._evolve_adaptive(
+            self.ψ,
+            self._V_dev,
+            self.g,
+            self.K2,
+            self.gamma,
+            self.kinetic_scale,
+            self.dx,
+            duration,
+            min(max(dt0, dt_min), dt_max),
+            dt_min,
+            dt_max,
+            tol,
+            max_steps,
+            self._coeffs(),
+            self.INTEGRATORS[self.integrator][0]
+        )
+        
+        # Ugyanabban a típusban hasonlítunk, mint a ciklusfeltétel
+        reached = bool(t >= jnp.asarray(duration, dtype=t.dtype))
+        self.time += float(t)
+        self._adaptive_dt = float(h)
+        self.ψ = self._normalize(current_psi, self.dx)
+        
+        if not reached:
+            print(f"⚠️ evolve_to: max_steps={max_steps} elérve, a futás t={self.time:.4f}-nél "
+                  f"megállt (cél: {t_target})")
+        
+        return {
+            'time': self.time,
+            'accepted': int(accepted),
+            'rejected': int(rejected),
+            'dt': self._adaptive_dt,
+            'reached': reached
+        }
 
     
     def excite_mode(self, mode_index, strength=1.0):
@@ -305,46 +980,64 @@ class FluidSTRATOS:
         pattern = mode['pattern'](self.X, self.Y)
         
         # Fázisrúgás a mező aktuális állapotán
-        self.ψ = self.ψ * np.exp(1j * strength * np.real(pattern))
+        self.ψ = self.ψ * jnp.exp(1j * strength * jnp.asarray(np.real(pattern), dtype=self.real_dtype))
         
         # Normalizálás
-        norm = np.sqrt(np.sum(np.abs(self.ψ)**2) * self.dx**2)
-        self.ψ = self.ψ / norm
+        self.ψ = self._normalize(self.ψ, self.dx)
     
+    def _build_mode_weights(self):
+        """
+        Mód súlymátrix: minden sor egy mód Gauss súlya a kilapított rácson
+        """
+        weights = [
+            np.exp(-((self.X-x0)**2 + (self.Y-y0)**2)/4.0).ravel()
+            for x0, y0 in (mode['position'] for mode in self.modes)
+        ]
+        return jnp.asarray(np.stack(weights), dtype=self.real_dtype)
+
+    @staticmethod
+    @jit
+    def _mode_energies(ψ, weights):
+        """
+        Mind a 16 mód energiája egyetlen mátrix-vektor szorzással
+        (a dx² szorzó a normalizáláskor kiesik)
+        """
+        density = jnp.abs(ψ)**2
+        energies = weights @ density.ravel()
+        return energies / (jnp.sum(energies) + 1e-10)
+
     def measure_mode_energies(self):
         """
         Az energia eloszlás a 16 mód között
         
         Ez a "demokratikus szavazás"!
         """
-        density = np.abs(self.ψ)**2
+        return np.asarray(self._mode_energies(self.ψ, self._mode_weights))
+    
+    @staticmethod
+    @jit
+    def _mode_entropy(energies):
+        """Shannon entrópia a mód eloszláson (0 valószínűségek kihagyásával)"""
+        p = energies / jnp.sum(energies)
+        safe_p = jnp.where(p > 0, p, 1.0)
+        return -jnp.sum(jnp.where(p > 0, p * jnp.log(safe_p), 0.0))
+
+    @staticmethod
+    @jit
+    def _coherence(ψ):
+        """Koherencia: tanh(max|ψ|² / (15 · átlag|ψ|²))"""
+        density = jnp.abs(ψ)**2
         
-        energies = []
-        for mode in self.modes:
-            x0, y0 = mode['position']
-            
-            # Gauss súly a mód körül
-            weight = np.exp(-((self.X-x0)**2 + (self.Y-y0)**2)/4.0)
-            
-            # Energia = súlyozott integráció
-            energy = np.sum(density * weight) * self.dx**2
-            
-            energies.append(energy)
+        max_density = jnp.max(density)
+        mean_density = jnp.mean(density)
         
-        # Normalizálás
-        energies = np.array(energies)
-        return energies / (np.sum(energies) + 1e-10)
-    
+        return jnp.tanh(max_density / (mean_density * 15))
+
     def coherence(self):
         """
         Koherencia mérés
         """
-        density = np.abs(self.ψ)**2
-        
-        max_density = np.max(density)
-        mean_density = np.mean(density)
-        
-        return np.tanh(max_density / (mean_density * 15))
+        return float(self._coherence(self.ψ))
     
     def hope_genome_vote(self):
         """
@@ -382,94 +1075,462 @@ class FluidSTRATOS:
         x0, y0 = experience_position
         
         # Lokalizált hullámcsomag
-        σ = 1.0 / emotion_intensity  # Intenzív = lokalizált
-        phase = emotion_valence * np.pi  # Pozitív/negatív
-        
-        memory_packet = emotion_intensity * \
-                       np.exp(-((self.X-x0)**2 + (self.Y-y0)**2)/(2*σ**2)) * \
-                       np.exp(1j * phase)
+        memory_packet = self._memory_packet(self.X, self.Y, (x0, y0, emotion_intensity, emotion_valence))
         
         # BELESIMUL A MEZŐBE
-        self.ψ = self.ψ + 0.1 * memory_packet
+        self.ψ = self.ψ + 0.1 * jnp.asarray(memory_packet, dtype=self.complex_dtype)
         
         # Normalizálás
-        norm = np.sqrt(np.sum(np.abs(self.ψ)**2) * self.dx**2)
-        self.ψ = self.ψ / norm
+        self.ψ = self._normalize(self.ψ, self.dx)
+        self.memories.add((x0, y0), emotion_intensity, emotion_valence, time=self.time)
         
         print(f"💾 Emlék tárolva: ({x0:.1f}, {y0:.1f}), I={emotion_intensity:.2f}")
     
-    def emotimem_recall(self, context_position, evolution_steps=50):
+    @staticmethod
+    def _memory_packet(X, Y, params, xp=np):
+        """
+        Emlék hullámcsomag egy (x0, y0, intensity, valence) sorból
+        σ = 1/intensity (intenzív = lokalizált), fázis = valence·π (pozitív/negatív)
+        """
+        x0, y0, intensity, valence = params
+        σ = 1.0 / intensity
+        return intensity * xp.exp(-((X - x0)**2 + (Y - y0)**2) / (2 * σ**2)) * xp.exp(1j * valence * xp.pi)
+
+    def emotimem_store_batch(self, positions, intensities, valences, settle_steps=0):
+        """
+        EmotiMem: sok emlék tárolása egyetlen fordított hívásban
+
+        positions: (N, 2), intensities és valences: (N,) vagy skalár
+        A Gauss csomag szeparálható: tengelyenként a hordozójára (_GAUSS_CUTOFF·σ)
+        vágott 1D tényezők, az összeg egy (Ny × N)·(N × Nx) mátrixszorzat,
+        utána egyetlen normalizálás.
+        settle_steps > 0: emlékenként tárolás + settle_steps lépés (mint
+        emotimem_store + evolve(settle_steps) sorban), egy fordított ciklusban
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = len(positions)
+        intensities = np.broadcast_to(np.asarray(intensities, dtype=np.float64), (n,))
+        valences = np.broadcast_to(np.asarray(valences, dtype=np.float64), (n,))
+        if n == 0:
+            return
+        if np.any(intensities <= 0):
+            raise ValueError("Az emlék intenzitásának pozitívnak kell lennie")
+
+        # Katalógus: settle módban minden emlék a saját tárolási idejével
+        self.memories.add(positions, intensities, valences,
+                          time=self.time + np.arange(n) * settle_steps * self.dt)
+        self._inject_memories(positions, intensities, valences, settle_steps)
+
+        print(f"💾 {n} emlék tárolva")
+
+    def _inject_memories(self, positions, intensities, valences, settle_steps=0):
+        """Csomagok bejuttatása ψ-be (_store_batch), a katalógus érintése nélkül"""
+        _, X, Y = self._landscape_dev
+        params = np.column_stack([positions, intensities, valences])
+        self.ψ = self._store_batch(
+            self.ψ,
+            X[0],
+            Y[:, 0],
+            jnp.asarray(params, dtype=self.real_dtype),
+            self._V_dev,
+            self.g,
+            self.dt,
+            self._kinetic_propagator(),
+            self.gamma,
+            self.dx,
+            settle_steps,
+            self._coeffs(),
+            settle_steps > 0
+        )
+        self.time += len(params) * settle_steps * self.dt
+
+    def emotimem_consolidate(self, merge_radius=1.0, min_intensity=0.05, reseed=False, settle_steps=0):
+        """
+        EmotiMem konszolidáció hosszú munkamenetekhez
+
+        Az emlékek aktuális erőssége intensity·e^(-γ·kor) (csillapítás). Ezzel a
+        katalógus merge_radius-on belüli (láncolt) emlékei egy reprezentánssá
+        olvadnak, a min_intensity alattiak törlődnek (MemoryIndex.consolidate);
+        a rekordok az aktuális erősséget és időt kapják.
+        reseed=True: ψ újraépül a kezdeti mezőből és a konszolidált emlékekből
+                     (settle_steps-szel, mint emotimem_store_batch), így az átfedő,
+                     lecsengett maradványok eltűnnek a mezőből
+        Return: {'merged', 'pruned', 'remaining'}
+        """
+        columns = self.memories.arrays()
+        decayed = columns['intensity'] * np.exp(-self.gamma * (self.time - columns['time']))
+        summary = self.memories.consolidate(merge_radius, min_intensity,
+                                            intensities=decayed, time=self.time)
+
+        if reseed:
+            columns = self.memories.arrays()
+            self.ψ = jnp.asarray(self._initialize_field(), dtype=self.complex_dtype)
+            if len(columns['id']):
+                self._inject_memories(columns['position'], columns['intensity'],
+                                      columns['valence'], settle_steps)
+
+        print(f"🧹 Konszolidáció: {summary['merged']} összevonva, {summary['pruned']} törölve, "
+              f"{summary['remaining']} emlék maradt")
+        return summary
+
+    @staticmethod
+    def _packet_sum(x, y, params):
+        """
+        Emlék csomagok összege szeparált alakban: Σ_n w_n·gy_n(y)·gx_n(x)
+        params: (N, 4) sorok (x0, y0, intensity, valence), w_n = intensity·e^(iπ·valence)
+        """
+        x0, y0, intensity, valence = params.T
+        σ = 1.0 / intensity
+
+        def factor(grid, center):
+            d = grid[None, :] - center[:, None]
+            inside = jnp.abs(d) <= _GAUSS_CUTOFF * σ[:, None]
+            return jnp.where(inside, jnp.exp(-d**2 / (2 * σ[:, None]**2)), 0.0)
+
+        w = intensity * jnp.exp(1j * valence * jnp.pi)
+        return jnp.einsum('n,ny,nx->yx', w, factor(y, y0), factor(x, x0))
+
+    @staticmethod
+    @partial(jit, static_argnames=('coeffs', 'settle'))
+    def _store_batch(ψ, x, y, params, V, g, dt, kinetic_ops, gamma, dx, settle_steps, coeffs, settle):
+        """
+        emotimem_store_batch magja
+        settle=False: minden csomag egyszerre, egy normalizálás
+        settle=True: lax.scan az emlékeken (tárolás, normalizálás, settle_steps lépés)
+        """
+        add = lambda ψ, params: ψ + 0.1 * FluidSTRATOS._packet_sum(x, y, params).astype(ψ.dtype)
+
+        if not settle:
+            return FluidSTRATOS._normalize(add(ψ, params), dx)
+
+        def store_and_settle(ψ, p):
+            ψ = FluidSTRATOS._normalize(add(ψ, p[None]), dx)
+            ψ = FluidSTRATOS._split_steps(ψ, V, g, dt, kinetic_ops, gamma, settle_steps, coeffs)
+            return FluidSTRATOS._normalize(ψ, dx), None
+
+        ψ, _ = lax.scan(store_and_settle, ψ, params)
+        return ψ
+
+    def emotimem_candidates(self, context_position, radius=3.0):
+        """
+        A kontextus közelében tárolt emlékek a katalógusból (fejlődés nélkül)
+        Return: rekordok távolság szerint növekvő sorrendben (lásd MemoryIndex)
+        """
+        return self.memories.query_radius(context_position, radius)
+
+    def emotimem_recall(self, context_position, evolution_steps=50, top_k=5, window=5,
+                        match_radius=1.5, prefilter_radius=None):
         """
         EmotiMem: Visszaidézés rezonanciával
+
+        Gerjesztés, fejlődés és csúcskeresés egyetlen fordított programban:
+        a legerősebb top_k csúcs intenzitás szerint csökkenő sorrendben,
+        rácsköz alatti (parabolikus) pozícióval, egy eszköz -> host másolással.
+        window: a lokális maximum ablak mérete (rácspontban, ≥ 1; páros is lehet)
+
+        Minden csúcs a katalógus legközelebbi, match_radius-on belüli emlékéhez
+        rendelődik ('memory': rekord vagy None, 'memory_distance').
+        prefilter_radius: ha meg van adva, és ezen belül nincs tárolt emlék,
+                          a fejlődés és a csúcskeresés elmarad (üres eredmény)
         """
         x0, y0 = context_position
-        
-        # Kontextus gerjesztés
-        context_wave = np.exp(-((self.X-x0)**2 + (self.Y-y0)**2)/8.0)
-        self.ψ = self.ψ + 0.2 * context_wave
-        
-        # Normalizálás
-        norm = np.sqrt(np.sum(np.abs(self.ψ)**2) * self.dx**2)
-        self.ψ = self.ψ / norm
-        
-        # Hagy időt a rezonanciának
-        self.evolve(steps=evolution_steps)
-        
-        # Megnézzük mi aktiválódott
-        density = np.abs(self.ψ)**2
-        
-        # Csúcsok keresése (emlékek)
-        from scipy.ndimage import maximum_filter
-        local_max = maximum_filter(density, size=5)
-        peaks = (density == local_max) & (density > np.mean(density) * 2)
-        
+        if window < 1:
+            raise ValueError(f"Az ablakméretnek legalább 1-nek kell lennie: {window}")
+
+        if prefilter_radius is not None and not self.emotimem_candidates(context_position, prefilter_radius):
+            print("🔍 Nincs tárolt emlék a kontextus közelében")
+            return []
+
+        current_psi, positions, intensities, valid = self._recall(
+            self.ψ,
+            self._V_dev,
+            *self._landscape_dev[1:],
+            jnp.asarray([x0, y0], dtype=self.real_dtype),
+            self.g,
+            self.dt,
+            self._kinetic_propagator(),
+            self.gamma,
+            self.dx,
+            evolution_steps,
+            self._coeffs(),
+            top_k,
+            window
+        )
+        self.ψ = current_psi
+        self.time += evolution_steps * self.dt
+
+        positions, intensities, valid = jax.device_get((positions, intensities, valid))
         recalled_memories = []
-        y_peaks, x_peaks = np.where(peaks)
-        
-        for xp, yp in zip(x_peaks[:5], y_peaks[:5]):  # Top 5
-            x_pos = self.X[0, xp]
-            y_pos = self.Y[yp, 0]
-            intensity = density[yp, xp]
-            
+        for (x, y), intensity in zip(positions[valid], intensities[valid]):
+            memory, distance = self.memories.nearest((x, y), max_distance=match_radius)
             recalled_memories.append({
-                'position': (x_pos, y_pos),
-                'intensity': intensity
+                'position': (float(x), float(y)),
+                'intensity': float(intensity),
+                'memory': memory,
+                'memory_distance': distance,
             })
-        
-        print(f"🔍 {len(recalled_memories)} emlék aktiválódott")
-        
+
+        matched = sum(r['memory'] is not None for r in recalled_memories)
+        print(f"🔍 {len(recalled_memories)} emlék aktiválódott ({matched} azonosítva)")
+
         return recalled_memories
-    
-    def meditate(self, steps=100):
+
+    @staticmethod
+    @partial(jit, static_argnames=('coeffs', 'top_k', 'window'))
+    def _recall(ψ, V, X, Y, context, g, dt, kinetic_ops, gamma, dx, steps, coeffs, top_k, window):
+        """
+        Kontextus gerjesztés + rezonancia idő + csúcskeresés (emotimem_recall magja)
+        """
+        context_wave = jnp.exp(-((X - context[0])**2 + (Y - context[1])**2) / 8.0)
+        ψ = FluidSTRATOS._normalize(ψ + 0.2 * context_wave, dx)
+
+        # Hagy időt a rezonanciának
+        ψ = FluidSTRATOS._split_steps(ψ, V, g, dt, kinetic_ops, gamma, steps, coeffs)
+        ψ = FluidSTRATOS._normalize(ψ, dx)
+
+        return (ψ,) + FluidSTRATOS._find_peaks(jnp.abs(ψ)**2, X, Y, top_k, window)
+
+    @staticmethod
+    @partial(jit, static_argnames=('top_k', 'window', 'threshold'))
+    def _find_peaks(density, X, Y, top_k=5, window=5, threshold=2.0):
+        """
+        Csúcskeresés az eszközön
+        Lokális maximum: a window × window ablak maximuma (max-pool, szélen ismételt
+        értékekkel), és az átlag threshold-szorosánál erősebb.
+        A pozíció tengelyenként a szomszédokra illesztett parabola csúcsa.
+        Return: (positions (top_k, 2), intensities (top_k,), valid (top_k,))
+                intenzitás szerint csökkenő sorrendben; kevesebb csúcsnál valid = False
+        """
+        # Páros ablaknál aszimmetrikus kitöltés (mint scipy maximum_filter: előtte eggyel több)
+        padded = jnp.pad(density, (window // 2, (window - 1) // 2), mode='edge')
+        local_max = lax.reduce_window(padded, -jnp.inf, lax.max,
+                                      (window, window), (1, 1), 'VALID')
+        peaks = (density == local_max) & (density > jnp.mean(density) * threshold)
+
+        scores, flat = lax.top_k(jnp.where(peaks, density, -jnp.inf).ravel(), top_k)
+        iy, ix = jnp.unravel_index(flat, density.shape)
+        valid = jnp.isfinite(scores)
+
+        # Parabolikus finomítás: δ = (f₋ - f₊) / (2 (f₋ - 2 f₀ + f₊)), |δ| ≤ 1/2
+        def refine(f_minus, f0, f_plus):
+            curvature = f_minus - 2 * f0 + f_plus
+            safe = jnp.where(curvature < 0, curvature, -1.0)
+            delta = jnp.where(curvature < 0, (f_minus - f_plus) / (2 * safe), 0.0)
+            delta = jnp.clip(delta, -0.5, 0.5)
+            return delta, f0 - (f_minus - f_plus) * delta / 4
+
+        ny, nx = density.shape
+        at = lambda jy, jx: density[jnp.clip(jy, 0, ny - 1), jnp.clip(jx, 0, nx - 1)]
+        f0 = density[iy, ix]
+        dx_sub, peak_x = refine(at(iy, ix - 1), f0, at(iy, ix + 1))
+        dy_sub, peak_y = refine(at(iy - 1, ix), f0, at(iy + 1, ix))
+
+        step_x = X[0, 1] - X[0, 0]
+        step_y = Y[1, 0] - Y[0, 0]
+        positions = jnp.stack([X[iy, ix] + dx_sub * step_x, Y[iy, ix] + dy_sub * step_y], axis=-1)
+        intensities = jnp.where(valid, peak_x + peak_y - f0, 0.0)
+        return positions, intensities, valid
+
+    @staticmethod
+    @jit
+    def _ground_state_energy(ψ, V, g, K2, kinetic_scale, dx):
+        """
+        GPE energia funkcionál: ∫ [kinetic_scale/2 |∇ψ|² + V|ψ|² + g/2 |ψ|⁴] dx dy
+        A kinetikus tag spektrálisan (Parseval), ugyanazzal a K²-tel mint _gpe_step_2d
+        """
+        density = jnp.abs(ψ)**2
+        ψ_k = jnp.fft.fft2(ψ)
+        kinetic = jnp.sum(0.5 * kinetic_scale * K2 * jnp.abs(ψ_k)**2) / ψ.size
+        potential = jnp.sum((V + 0.5 * g * density) * density)
+        return (kinetic + potential) * dx**2
+
+    @staticmethod
+    @jit
+    def _imaginary_time(ψ, V, g, dt, K2, kinetic_scale, dx, tol, max_steps):
+        """
+        Spektrális imaginárius idejű split-step (exp(-K² dt) a kinetikus részre)
+        Addig fut, amíg az energia változása egy lépésben tol alá nem esik,
+        vagy el nem éri a max_steps lépést. Return: (iterációk, ψ, energia, reziduum)
+        """
+        kinetic_half = jnp.exp(-dt * K2 * kinetic_scale / 4)
+
+        def step(ψ):
+            ψ = jnp.fft.ifft2(jnp.fft.fft2(ψ) * kinetic_half)
+            ψ = ψ * jnp.exp(-dt * (V + g * jnp.abs(ψ)**2))
+            ψ = jnp.fft.ifft2(jnp.fft.fft2(ψ) * kinetic_half)
+            return FluidSTRATOS._normalize(ψ, dx)
+
+        def energy(ψ):
+            return FluidSTRATOS._ground_state_energy(ψ, V, g, K2, kinetic_scale, dx)
+
+        def cond(carry):
+            i, _, _, residual = carry
+            return (i < max_steps) & (residual > tol)
+
+        def body(carry):
+            i, ψ, E, _ = carry
+            ψ = step(ψ)
+            E_new = energy(ψ)
+            return i + 1, ψ, E_new, jnp.abs(E_new - E)
+
+        ψ = FluidSTRATOS._normalize(ψ.astype(jnp.result_type(ψ, jnp.complex64)), dx)
+        E0 = energy(ψ)
+        init = (jnp.asarray(0), ψ, E0, jnp.asarray(jnp.inf, dtype=E0.dtype))
+        return lax.while_loop(cond, body, init)
+
+    def meditate(self, steps=5000, tol=1e-6, dt=None):
         """
         Meditáció: alapállapot keresés
+        
+        Spektrális imaginárius idejű evolúció, egyetlen fordított ciklusban.
+        steps: maximális iterációszám
+        tol: leállás, ha az energia változása egy lépésben ennél kisebb
+        dt: imaginárius időlépés (alapértelmezés: self.dt)
+        Return: {'iterations', 'energy', 'residual', 'converged'}
         """
         print("🧘 Meditáció...")
         
-        # Imaginárius idő evolúció
-        # We need to convert to numpy for the roll operations or use jnp.roll
-        # Let's stick to numpy as per original code for this part, or update to JAX.
-        # The original code used numpy roll.
+        if dt is None:
+            dt = self.dt
+        
+        iterations, ψ, energy, residual = self._imaginary_time(
+            self.ψ,
+            self._V_dev,
+            self.g,
+            dt,
+            self.K2,
+            self.kinetic_scale,
+            self.dx,
+            tol,
+            steps
+        )
+        self.ψ = ψ
         
-        for _ in range(steps):
-            # Laplacian (finite difference)
-            ψ_xx = (np.roll(self.ψ, 1, 0) + np.roll(self.ψ, -1, 0) - 2*self.ψ) / self.dx**2
-            ψ_yy = (np.roll(self.ψ, 1, 1) + np.roll(self.ψ, -1, 1) - 2*self.ψ) / self.dx**2
-            
-            # Hamiltonian
-            V_total = self.V + self.g * np.abs(self.ψ)**2
-            H_ψ = -0.5 * (ψ_xx + ψ_yy) + V_total * self.ψ
-            
-            # Imaginárius lépés
-            self.ψ = self.ψ - self.dt * H_ψ
-            
-            # Normalizálás
-            norm = np.sqrt(np.sum(np.abs(self.ψ)**2) * self.dx**2)
-            self.ψ = self.ψ / norm
+        result = {
+            'iterations': int(iterations),
+            'energy': float(energy),
+            'residual': float(residual),
+            'converged': bool(residual <= tol)
+        }
         
         coherence = self.coherence()
-        print(f"✨ Koherencia: {coherence:.3f}")
+        print(f"✨ Koherencia: {coherence:.3f} "
+              f"({result['iterations']} iteráció, E={result['energy']:.4f}, ΔE={result['residual']:.1e})")
+        
+        return result
     
+    def save(self, path, gardener=None, compress=None):
+        """
+        Teljes állapot mentése egy checkpoint fájlba (lásd checkpoint.py)
+        ψ, rácsok, statikus tájkép, gátak/csatornák ID szerint, a futó V összeg,
+        fizika paraméterek, idő, módok, emlékkatalógus és opcionálisan egy
+        RLGardener állapota (Q-tábla, PRNG kulcs, hiperparaméterek).
+        compress: None (memóriába képezhető), 'zlib' vagy 'zstd'
+        """
+        barrier_ids = list(self.active_barriers)
+        coupling_ids = list(self.active_couplings)
+        barriers, channels = self.landscape_params()
+
+        arrays = {
+            'psi': self.ψ,
+            'X': self.X, 'Y': self.Y, 'KX': self.KX, 'KY': self.KY, 'K2': self.K2,
+            'V_static': self.V_static,
+            'V_total': self._V_total,
+            'barriers': barriers,
+            'channels': channels,
+            'mode_positions': np.array([mode['position'] for mode in self.modes]),
+            'mode_frequencies': np.array([mode['frequency'] for mode in self.modes]),
+            'mode_weights': self._mode_weights,
+        }
+        memory_arrays, memory_meta = self.memories.checkpoint_state()
+        arrays.update({f"memories/{name}": value for name, value in memory_arrays.items()})
+
+        meta = {
+            'format': 'fluid_stratos',
+            'precision': self.precision,
+            'integrator': self.integrator,
+            'grid_size': [self.Nx, self.Ny],
+            'domain_size': self.L,
+            'dx': self.dx,
+            'g': float(self.g), 'dt': float(self.dt), 'gamma': float(self.gamma),
+            'kinetic_scale': float(self.kinetic_scale),
+            'time': float(self.time),
+            'adaptive_dt': self._adaptive_dt,
+            'mode_names': self.mode_names,
+            'barrier_ids': barrier_ids,
+            'coupling_ids': coupling_ids,
+            'memories': memory_meta,
+        }
+        if gardener is not None:
+            gardener_arrays, meta['gardener'] = gardener.checkpoint_state()
+            arrays.update({f"gardener/{name}": value for name, value in gardener_arrays.items()})
+
+        save_arrays(path, {name: np.asarray(value) for name, value in arrays.items()}, meta, compress)
+        print(f"💾 Állapot mentve: {path}")
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Állapot betöltése save() kimenetéből
+        mmap=True: a tömörítetlen tömbök memóriába képezve (a rácsok és a
+        súlymátrix nem épülnek újra, a betöltés ideje nem függ a rács méretétől)
+        A mentett kertész állapot: RLGardener.load(path)
+        """
+        arrays, meta = load_arrays(path, mmap=mmap)
+        if meta.get('format') != 'fluid_stratos':
+            raise ValueError(f"Nem FluidSTRATOS checkpoint: {path}")
+
+        self = cls.__new__(cls)
+        cls._check_precision(meta['precision'])
+        self.precision = meta['precision']
+        self.real_dtype, self.complex_dtype = cls.PRECISIONS[self.precision]
+
+        # Mező és rácsok (memmap: lusta beolvasás)
+        self.Nx, self.Ny = meta['grid_size']
+        self.L = meta['domain_size']
+        self.dx = meta['dx']
+        self.X, self.Y = arrays['X'], arrays['Y']
+        self.KX, self.KY = arrays['KX'], arrays['KY']
+        self.K2 = jnp.asarray(arrays['K2'])
+        self.ψ = jnp.asarray(arrays['psi'])
+
+        # Tájkép: a futó float64 összeg copy-on-write memmap, a módosítások nem írnak a fájlba
+        self.V_static = arrays['V_static']
+        self._landscape_dev = tuple(jnp.asarray(a, dtype=self.real_dtype)
+                                    for a in (self.V_static, self.X, self.Y))
+        self.active_barriers = {key: tuple(row) for key, row in
+                                zip(meta['barrier_ids'], arrays['barriers'].tolist())}
+        self.active_couplings = {key: tuple(row) for key, row in
+                                 zip(meta['coupling_ids'], arrays['channels'].tolist())}
+        self._V_total = arrays['V_total']
+        self._V_dev = jnp.asarray(self._V_total, dtype=self.real_dtype)
+        self._V_view = None
+
+        # Fizika paraméterek
+        self.g, self.dt, self.gamma = meta['g'], meta['dt'], meta['gamma']
+        self.kinetic_scale = meta['kinetic_scale']
+        self.integrator = meta['integrator']
+        self._kinetic_key = None
+        self._kinetic_cache = None
+        self._adaptive_dt = meta['adaptive_dt']
+
+        # Módok a mentett középpontokkal
+        self.mode_names = meta['mode_names']
+        self.modes = self._define_standing_wave_modes([tuple(p) for p in arrays['mode_positions'].tolist()])
+        for mode, frequency in zip(self.modes, arrays['mode_frequencies'].tolist()):
+            mode['frequency'] = frequency
+        self._mode_index = {m['name']: i for i, m in enumerate(self.modes)}
+        self._mode_weights = jnp.asarray(arrays['mode_weights'])
+
+        # Állapot
+        self.time = meta['time']
+        self.history = []
+        self.memories = MemoryIndex.from_checkpoint_state(
+            {name[len('memories/'):]: value for name, value in arrays.items() if name.startswith('memories/')},
+            meta['memories']
+        )
+        return self
+
     def visualize(self):
         """
         Vizualizáció
@@ -479,7 +1540,7 @@ class FluidSTRATOS:
         fig, axes = plt.subplots(1, 3, figsize=(15, 5))
         
         # 1. Kognitív sűrűség
-        density = np.abs(self.ψ)**2
+        density = np.abs(np.asarray(self.ψ))**2
         im1 = axes[0].imshow(density, extent=[-self.L/2, self.L/2]*2,
                             origin='lower', cmap='viridis')
         axes[0].set_title('Kognitív Mező Sűrűség |Ψ|²')
@@ -494,7 +1555,7 @@ class FluidSTRATOS:
                         bbox=dict(boxstyle='round', facecolor='black', alpha=0.5))
         
         # 2. Potenciál tájkép
-        im2 = axes[1].imshow(self.V, extent=[-self.L/2, self.L/2]*2,
+        im2 = axes[1].imshow(np.asarray(self._V_dev), extent=[-self.L/2, self.L/2]*2,
                             origin='lower', cmap='coolwarm')
         axes[1].set_title('Potenciál Tájkép V(x,y)')
         plt.colorbar(im2, ax=axes[1])
@@ -532,7 +1593,7 @@ class FluidSTRATOS:
         ax.set_title("Kognitív Mező Áramlása")
         
         # Kezdeti állapot plot
-        density = np.abs(self.ψ)**2
+        density = np.abs(np.asarray(self.ψ))**2
         im = ax.imshow(density, extent=[-self.L/2, self.L/2]*2,
                       origin='lower', cmap='viridis', vmin=0, vmax=np.max(density)*0.8)
         
@@ -542,18 +1603,15 @@ class FluidSTRATOS:
             ax.plot(x0, y0, 'r.', markersize=2, alpha=0.5)
             # ax.text(x0, y0, mode['name'][:2], color='white', fontsize=6, alpha=0.5)
 
-        # JAX optimalizáció miatt konvertáljuk a konstansokat
-        j_V = jnp.array(self.V)
-        j_K2 = jnp.array(self.K2)
-        current_psi = jnp.array(self.ψ)
+        current_psi = self.ψ
 
         def update(frame):
             nonlocal current_psi
             # 5 fizikai lépés per frame az animáció sebességéért
-            for _ in range(5):
-                current_psi = self._gpe_step_2d(
-                    current_psi, j_V, self.g, self.dt, j_K2, self.gamma
-                )
+            current_psi = self._evolve_n(
+                current_psi, self._V_dev, self.g, self.dt,
+                self._kinetic_propagator(), self.gamma, 5, self._coeffs()
+            )
             
             # Megjelenítés
             psi_np = np.array(current_psi)
@@ -567,9 +1625,7 @@ class FluidSTRATOS:
         ani.save(filename, writer=writer)
         
         # Állapot frissítése a végén
-        self.ψ = np.array(current_psi)
-        norm = np.sqrt(np.sum(np.abs(self.ψ)**2) * self.dx**2)
-        self.ψ = self.ψ / norm
+        self.ψ = self._normalize(current_psi, self.dx)
         
         print(f"💾 Animáció mentve: {filename}")
 
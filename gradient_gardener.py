@@ -0,0 +1,184 @@
+"""
+GRADIENT GARDENER - A Deriváló Kertész
+Gradiens alapú tájkép-optimalizálás a differenciálható simulate() API-n
+"""
+from fluid_stratos import FluidSTRATOS
+import matplotlib.pyplot as plt
+import numpy as np
+import jax
+import jax.numpy as jnp
+
+# Beavatkozási tartományok (gátmagasság, csatornamélység)
+BARRIER_RANGE = (0.0, 2.0)
+CHANNEL_RANGE = (0.0, 6.0)
+
+
+class Adam:
+    """
+    Adam optimalizáló (optax-stílusú, funkcionális): init(params) -> state,
+    update(grads, state, params) -> (params, state), tetszőleges pytree-n
+    """
+    def __init__(self, learning_rate=0.001, b1=0.9, b2=0.999, eps=1e-8):
+        self.learning_rate = learning_rate
+        self.b1 = b1
+        self.b2 = b2
+        self.eps = eps
+
+    def init(self, params):
+        zeros = jax.tree_util.tree_map(jnp.zeros_like, params)
+        return {'count': 0, 'mu': zeros, 'nu': zeros}
+
+    def update(self, grads, state, params):
+        count = state['count'] + 1
+        mu = jax.tree_util.tree_map(lambda m, g: self.b1 * m + (1 - self.b1) * g, state['mu'], grads)
+        nu = jax.tree_util.tree_map(lambda v, g: self.b2 * v + (1 - self.b2) * g**2, state['nu'], grads)
+
+        # Torzítás-korrekció
+        lr = self.learning_rate * np.sqrt(1 - self.b2**count) / (1 - self.b1**count)
+        params = jax.tree_util.tree_map(
+            lambda p, m, v: p - lr * m / (jnp.sqrt(v) + self.eps), params, mu, nu
+        )
+        return params, {'count': count, 'mu': mu, 'nu': nu}
+
+
+class GradientGardener:
+    """
+    A gát erősségét és a csatorna mélységét a horizont menti mód-energia
+    hibán át deriválva hangolja (nem próbálgatással, mint az RL kertész)
+    """
+    def __init__(self, system, target_brain_energy=0.20, target_energies=None,
+                 horizon=50, iterations=3, learning_rate=0.2,
+                 coupling=("Intuition", "Logic")):
+        self.system = system
+        self.target = target_brain_energy
+        self.horizon = horizon         # Ennyi lépésre előre szimulál döntésenként
+        self.iterations = iterations   # Gradiens lépések döntésenként
+        self.coupling = coupling
+        self.brain_index = 0 # Brain is mode 0
+        self.barrier_id = "brain_shield"
+        self.coupling_id = "gardener_channel"
+
+        # Cél eloszlás: vagy csak a Brain energia, vagy a teljes 16 elemű eloszlás
+        n = len(system.modes)
+        if target_energies is None:
+            self._target = jnp.zeros(n).at[self.brain_index].set(target_brain_energy)
+            self._mask = jnp.zeros(n).at[self.brain_index].set(1.0)
+        else:
+            target_energies = np.asarray(target_energies, dtype=float)
+            self._target = jnp.asarray(target_energies / target_energies.sum())
+            self._mask = jnp.ones(n)
+
+        # Kezdeti tájkép (ID-vel, hogy ne írjon felül más gátakat/csatornákat)
+        self.barrier_strength = 0.5
+        self.channel_depth = 0.0
+        system.set_barrier((0, 0), strength=self.barrier_strength, width=2.0, barrier_id=self.barrier_id)
+        system.set_coupling(*coupling, strength=self.channel_depth, coupling_id=self.coupling_id)
+
+        self.optimizer = Adam(learning_rate)
+        self.controls = {'barrier': jnp.asarray(self.barrier_strength),
+                         'channel': jnp.asarray(self.channel_depth)}
+        self.opt_state = self.optimizer.init(self.controls)
+        self._value_and_grad = jax.value_and_grad(self._loss)
+
+        self.simulated_steps = 0  # Optimalizálásra elhasznált (előre) szimulált lépések
+        self.history = {'time': [], 'brain_energy': [], 'barrier': [], 'channel': [], 'loss': []}
+        self.last_loss = None
+
+    def _loss(self, controls, params, psi0):
+        """Átlagos négyzetes eltérés a cél eloszlástól a horizont mentén"""
+        b = list(self.system.active_barriers).index(self.barrier_id)
+        c = list(self.system.active_couplings).index(self.coupling_id)
+        params = dict(params,
+                      barriers=params['barriers'].at[b, 2].set(controls['barrier']),
+                      channels=params['channels'].at[c, 4].set(controls['channel']))
+
+        record = self.system.simulate(params, psi0, steps=self.horizon,
+                                      record_every=max(1, self.horizon // 5))
+        error = (record['mode_energies'] - self._target)**2 * self._mask
+        return jnp.mean(jnp.sum(error, axis=-1) / jnp.sum(self._mask))
+
+    def observe(self):
+        """Méri a rendszer állapotát"""
+        energies = self.system.measure_mode_energies()
+        brain_energy = energies[self.brain_index]
+        return brain_energy
+
+    def act(self, current_brain_energy=None):
+        """
+        Beavatkozik a homeosztázis érdekében: néhány Adam lépés a
+        horizontra előre szimulált veszteségen, majd a tájkép frissítése
+        """
+        params = self.system.get_params()
+        psi0 = self.system.ψ
+
+        for _ in range(self.iterations):
+            loss, grads = self._value_and_grad(self.controls, params, psi0)
+            self.controls, self.opt_state = self.optimizer.update(grads, self.opt_state, self.controls)
+            self.controls = {
+                'barrier': jnp.clip(self.controls['barrier'], *BARRIER_RANGE),
+                'channel': jnp.clip(self.controls['channel'], *CHANNEL_RANGE),
+            }
+            self.simulated_steps += self.horizon
+
+        self.last_loss = float(loss)
+        self.barrier_strength = float(self.controls['barrier'])
+        self.channel_depth = float(self.controls['channel'])
+
+        # Beavatkozás
+        self.system.set_barrier((0, 0), strength=self.barrier_strength, width=2.0, barrier_id=self.barrier_id)
+        self.system.set_coupling(*self.coupling, strength=self.channel_depth, coupling_id=self.coupling_id)
+
+        return self.barrier_strength
+
+    def log(self, time, brain_energy, barrier):
+        self.history['time'].append(time)
+        self.history['brain_energy'].append(brain_energy)
+        self.history['barrier'].append(barrier)
+        self.history['channel'].append(self.channel_depth)
+        self.history['loss'].append(self.last_loss)
+
+    def plot_history(self):
+        fig, ax1 = plt.subplots(figsize=(10, 6))
+
+        ax1.set_xlabel('Time Steps')
+        ax1.set_ylabel('Brain Energy', color='tab:blue')
+        ax1.plot(self.history['time'], self.history['brain_energy'], color='tab:blue', label='Brain Energy')
+        ax1.axhline(self.target, color='gray', linestyle='--', label='Target')
+        ax1.tick_params(axis='y', labelcolor='tab:blue')
+
+        ax2 = ax1.twinx()
+        ax2.set_ylabel('Barrier / Channel', color='tab:orange')
+        ax2.plot(self.history['time'], self.history['barrier'], color='tab:orange', linestyle=':', label='Barrier')
+        ax2.plot(self.history['time'], self.history['channel'], color='tab:green', linestyle=':', label='Channel')
+        ax2.tick_params(axis='y', labelcolor='tab:orange')
+
+        plt.title('Gradient Gardener: Homeosztázis Szabályozás')
+        fig.tight_layout()
+        plt.savefig('gradient_gardener_log.png')
+        print("📊 Gardener log saved to gradient_gardener_log.png")
+
+if __name__ == "__main__":
+    print("🌿 INDUL A DERIVÁLÓ KERTÉSZ...")
+    stratos = FluidSTRATOS(grid_size=(64, 64))
+    gardener = GradientGardener(stratos, target_brain_energy=0.25)
+
+    # Szimuláció
+    steps = 400
+    print(f"🔄 Szimuláció futtatása ({steps} lépés)...")
+
+    for t in range(0, steps, 10):
+        # 1. Kertész beavatkozása (minden 10. lépésben)
+        e_brain = gardener.observe()
+        barrier = gardener.act(e_brain)
+        gardener.log(t, e_brain, barrier)
+
+        # Külső zavarás (perturbáció) a 200. lépésnél
+        if t == 200:
+            print("⚡ KÜLSŐ ZAVAR: Hirtelen energiafröccs a Brain-be!")
+            stratos.excite_mode(0, strength=2.0)
+
+        # 2. Fizika
+        stratos.evolve(steps=10)
+
+    print(f"🧮 Optimalizálásra szimulált lépések: {gardener.simulated_steps}")
+    gardener.plot_history()
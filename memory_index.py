@@ -0,0 +1,284 @@
+"""
+MEMORY INDEX - EmotiMem emlékkatalógus térbeli kereséssel
+Minden tárolt hullámcsomag metaadata (pozíció, intenzitás, valencia, idő),
+egyenletes rács-vödrökbe sorolva a szemantikai tér (domain) felett.
+"""
+import numpy as np
+
+
+class MemoryIndex:
+    """
+    Emlékregiszter + egyenletes rács térbeli index
+
+    A tartomány [-L/2, L/2]² cell_size oldalú cellákra oszlik; a tartományon
+    kívüli pozíciók a szélső cellákba kerülnek. Egy sugaras keresés csak a
+    sugár által érintett cellákat nézi, a legközelebbi emlék keresése cella-
+    gyűrűnként halad kifelé - egyenletes eloszlásnál mindkettő O(1) átlagosan.
+
+    Az emlékek sorszáma (id) növekvő és soha nem kerül újrahasznosításra.
+    """
+
+    def __init__(self, domain_size=20.0, cell_size=1.0):
+        if cell_size <= 0:
+            raise ValueError("A cellaméretnek pozitívnak kell lennie")
+
+        self.L = domain_size
+        self.cell_size = cell_size
+        self.n_cells = max(1, int(np.ceil(domain_size / cell_size)))
+
+        # Oszloponként tárolt rekordok (amortizált duplázással bővülnek)
+        self._size = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._positions = np.zeros((0, 2))
+        self._intensities = np.zeros(0)
+        self._valences = np.zeros(0)
+        self._times = np.zeros(0)
+        self._next_id = 0
+
+        # Cellák szerint rendezett nézet (CSR), módosítás után lustán épül újra
+        self._order = None
+        self._starts = None
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self, extra):
+        """Kapacitás bővítése legalább extra új rekordra"""
+        needed = self._size + extra
+        if needed <= len(self._ids):
+            return
+        capacity = max(needed, 2 * len(self._ids), 16)
+        resize = lambda a: np.concatenate([a, np.zeros((capacity - len(a),) + a.shape[1:], a.dtype)])
+        self._ids = resize(self._ids)
+        self._positions = resize(self._positions)
+        self._intensities = resize(self._intensities)
+        self._valences = resize(self._valences)
+        self._times = resize(self._times)
+
+    def add(self, positions, intensities, valences, time=0.0):
+        """
+        Emlékek felvétele
+        positions: (N, 2), intensities/valences/time: (N,) vagy skalár
+        Return: az új emlékek id-i (N,)
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = len(positions)
+        self._grow(n)
+
+        sl = slice(self._size, self._size + n)
+        ids = np.arange(self._next_id, self._next_id + n)
+        self._ids[sl] = ids
+        self._positions[sl] = positions
+        self._intensities[sl] = np.broadcast_to(intensities, (n,))
+        self._valences[sl] = np.broadcast_to(valences, (n,))
+        self._times[sl] = np.broadcast_to(time, (n,))
+
+        self._size += n
+        self._next_id += n
+        self._order = None
+        return ids
+
+    def records(self, rows=None):
+        """
+        Rekordok dict-ként (rows: belső sorindexek, None = mind)
+        {'id', 'position', 'intensity', 'valence', 'time'}
+        """
+        rows = np.arange(self._size) if rows is None else np.asarray(rows)
+        return [
+            {
+                'id': int(self._ids[r]),
+                'position': (float(self._positions[r, 0]), float(self._positions[r, 1])),
+                'intensity': float(self._intensities[r]),
+                'valence': float(self._valences[r]),
+                'time': float(self._times[r]),
+            }
+            for r in rows
+        ]
+
+    def arrays(self):
+        """Oszlopok NumPy másolatként: {'id', 'position' (N, 2), 'intensity', 'valence', 'time'}"""
+        n = self._size
+        return {'id': self._ids[:n].copy(), 'position': self._positions[:n].copy(),
+                'intensity': self._intensities[:n].copy(), 'valence': self._valences[:n].copy(),
+                'time': self._times[:n].copy()}
+
+    def checkpoint_state(self):
+        """Mentéshez: (tömbök, meta) - lásd from_checkpoint_state"""
+        meta = {'domain_size': self.L, 'cell_size': self.cell_size, 'next_id': self._next_id}
+        return self.arrays(), meta
+
+    @classmethod
+    def from_checkpoint_state(cls, arrays, meta):
+        """Katalógus visszaállítása a checkpoint_state() kimenetéből"""
+        index = cls(meta['domain_size'], meta['cell_size'])
+        index._ids = np.array(arrays['id'], dtype=np.int64)
+        index._positions = np.array(arrays['position'], dtype=np.float64).reshape(-1, 2)
+        index._intensities = np.array(arrays['intensity'], dtype=np.float64)
+        index._valences = np.array(arrays['valence'], dtype=np.float64)
+        index._times = np.array(arrays['time'], dtype=np.float64)
+        index._size = len(index._ids)
+        index._next_id = meta['next_id']
+        return index
+
+    def get(self, memory_id):
+        """Egy emlék rekordja id alapján (KeyError, ha nincs ilyen)"""
+        rows = np.flatnonzero(self._ids[:self._size] == memory_id)
+        if len(rows) == 0:
+            raise KeyError(f"Ismeretlen emlék: {memory_id}")
+        return self.records(rows)[0]
+
+    def remove(self, ids):
+        """Emlékek törlése id alapján (ismeretlen id-k figyelmen kívül)"""
+        keep = ~np.isin(self._ids[:self._size], np.asarray(ids))
+        self._keep_rows(np.flatnonzero(keep))
+
+    def _keep_rows(self, rows):
+        """Csak a megadott sorok maradnak (sorrendben), a többi törlődik"""
+        n = len(rows)
+        for name in ('_ids', '_positions', '_intensities', '_valences', '_times'):
+            column = getattr(self, name)
+            column[:n] = column[rows]
+        self._size = n
+        self._order = None
+
+    def clusters(self, radius):
+        """
+        Egyszeres láncolású klaszterek: radius-nál közelebbi emlékek (láncolva)
+        egy klaszterbe kerülnek
+        Return: klasztercímke soronként (N,), 0..K-1 az első előfordulás sorrendjében
+        """
+        parent = np.arange(self._size)
+
+        def root(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        positions = self._positions[:self._size]
+        for i, point in enumerate(positions):
+            (ix0, iy0), (ix1, iy1) = self._cell_coords([point - radius, point + radius])
+            rows = self._rows_in_cells(ix0, ix1, iy0, iy1)
+            rows = rows[rows > i]
+            close = rows[np.hypot(*(positions[rows] - point).T) <= radius]
+            for j in close:
+                ri, rj = root(i), root(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+        roots = np.array([root(i) for i in range(self._size)], dtype=np.int64)
+        return np.unique(roots, return_inverse=True)[1].reshape(-1)
+
+    def consolidate(self, merge_radius=1.0, min_intensity=0.0, intensities=None, time=None):
+        """
+        Konszolidáció: közeli emlékek összevonása, majd a gyengék törlése
+
+        intensities: a számoláshoz használt aktuális erősségek (pl. lecsengés után),
+                     alapértelmezés a tárolt intenzitás; az eredmény ezt írja vissza
+        time: ha meg van adva, minden megmaradó rekord ideje (a konszolidáció pillanata)
+
+        Klaszterenként egy reprezentáns: a legerősebb tag id-je és intenzitása (az
+        intenzitás a csomag szélességét is adja, σ = 1/I, ezért nem összegződik),
+        erősséggel súlyozott pozíció, és a fázisok (valence·π) erősséggel súlyozott átlaga.
+        Return: {'merged': összevont (eltűnt) rekordok, 'pruned': törölt, 'remaining': megmaradt}
+        """
+        n = self._size
+        if n == 0:
+            return {'merged': 0, 'pruned': 0, 'remaining': 0}
+
+        strength = self._intensities[:n] if intensities is None else np.asarray(intensities, dtype=np.float64)
+        labels = self.clusters(merge_radius)
+        k = labels.max() + 1
+
+        # Reprezentáns sor: a klaszter legerősebb tagja (holtversenyben a korábbi)
+        order = np.lexsort((np.arange(n), -strength, labels))
+        first = np.searchsorted(labels[order], np.arange(k))
+        rows = order[first]
+
+        weight = lambda values: np.bincount(labels, weights=strength * values, minlength=k)
+        total = np.bincount(labels, weights=strength, minlength=k)
+        safe_total = np.where(total > 0, total, 1.0)
+        positions = np.column_stack([weight(self._positions[:n, 0]), weight(self._positions[:n, 1])])
+        positions = np.where(total[:, None] > 0, positions / safe_total[:, None], self._positions[rows])
+        phase = np.angle(weight(np.cos(np.pi * self._valences[:n]))
+                         + 1j * weight(np.sin(np.pi * self._valences[:n])))
+        merged_intensity = strength[rows]
+        times = np.maximum.reduceat(self._times[:n][order], first)
+        if time is not None:
+            times = np.full(k, float(time))
+
+        self._keep_rows(np.sort(rows))
+        slot = np.argsort(rows)
+        self._positions[:k] = positions[slot]
+        self._intensities[:k] = merged_intensity[slot]
+        self._valences[:k] = (phase / np.pi)[slot]
+        self._times[:k] = times[slot]
+
+        weak = self._ids[:k][self._intensities[:k] < min_intensity]
+        self.remove(weak)
+        return {'merged': int(n - k), 'pruned': len(weak), 'remaining': self._size}
+
+    def _cell_coords(self, positions):
+        """Pozíciók (…, 2) -> (ix, iy) cellaindexek, a tartományon kívül a szélre vágva"""
+        cells = np.floor((np.asarray(positions) + self.L / 2) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.n_cells - 1)
+
+    def _build(self):
+        """Cellák szerint rendezett sorrend és cellánkénti kezdőindexek"""
+        cells = self._cell_coords(self._positions[:self._size])
+        flat = cells[:, 1] * self.n_cells + cells[:, 0]
+        self._order = np.argsort(flat, kind='stable')
+        self._starts = np.searchsorted(flat[self._order], np.arange(self.n_cells**2 + 1))
+
+    def _rows_in_cells(self, ix0, ix1, iy0, iy1):
+        """Az [ix0, ix1] × [iy0, iy1] cellatéglalap összes sora"""
+        if self._order is None:
+            self._build()
+        chunks = [self._order[self._starts[iy * self.n_cells + ix0]:self._starts[iy * self.n_cells + ix1 + 1]]
+                  for iy in range(iy0, iy1 + 1)]
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+    def query_radius(self, point, radius):
+        """
+        A point körüli radius sugarú körbe eső emlékek
+        Return: rekordok listája távolság szerint növekvő sorrendben
+        """
+        point = np.asarray(point, dtype=np.float64)
+        (ix0, iy0), (ix1, iy1) = self._cell_coords([point - radius, point + radius])
+        rows = self._rows_in_cells(ix0, ix1, iy0, iy1)
+
+        distances = np.hypot(*(self._positions[rows] - point).T)
+        inside = distances <= radius
+        rows, distances = rows[inside], distances[inside]
+        return self.records(rows[np.argsort(distances, kind='stable')])
+
+    def nearest(self, point, max_distance=np.inf):
+        """
+        A point-hoz legközelebbi emlék (max_distance-en belül)
+        Return: (rekord, távolság) vagy (None, inf)
+        """
+        if self._size == 0:
+            return None, np.inf
+
+        point = np.asarray(point, dtype=np.float64)
+        cx, cy = self._cell_coords(point)
+        best_row, best = None, np.inf
+
+        # Cella-gyűrűk kifelé: a még nem vizsgált (k. és további) gyűrűk
+        # legalább (k-1)·cell_size távolságra vannak
+        for k in range(self.n_cells):
+            if k > 0 and min(best, max_distance) <= (k - 1) * self.cell_size:
+                break
+            ix0, ix1 = max(cx - k, 0), min(cx + k, self.n_cells - 1)
+            iy0, iy1 = max(cy - k, 0), min(cy + k, self.n_cells - 1)
+            rows = self._rows_in_cells(ix0, ix1, iy0, iy1)
+            if len(rows) == 0:
+                continue
+            distances = np.hypot(*(self._positions[rows] - point).T)
+            i = np.argmin(distances)
+            if distances[i] < best:
+                best_row, best = rows[i], distances[i]
+
+        if best_row is None or best > max_distance:
+            return None, np.inf
+        return self.records([best_row])[0], float(best)
@@ -0,0 +1,174 @@
+"""
+PARALLEL RUNNER - Több magos tréning folyamat-készlettel
+Epizód-szeletek vagy paraméter-sweep pontok (viszkozitás, cél energia) külön
+folyamatokban, munkásonként rögzített JAX szálszámmal és CPU maggal.
+Az eredmények (Q-táblák, hozamok) determinisztikusan olvadnak össze a szülőben.
+
+Megjegyzés: ez a modul szándékosan nem importál JAX-ot a legfelső szinten -
+a munkások a szál-beállítások után, lustán töltik be.
+"""
+import os
+import multiprocessing as mp
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def _thread_env(threads):
+    """
+    Környezeti változók, amelyekkel a JAX/XLA legfeljebb `threads` szálat használ
+    threads == 1: az Eigen többszálúság kikapcsolva; különben az XLA szálkészlete
+    a munkás magcsoportjához (sched_setaffinity, _init_worker) igazodik
+    """
+    flags = os.environ.get('XLA_FLAGS', '')
+    if threads == 1:
+        flags += " --xla_cpu_multi_thread_eigen=false"
+    return {
+        'XLA_FLAGS': flags.strip(),
+        'OMP_NUM_THREADS': str(threads),
+        'MKL_NUM_THREADS': str(threads),
+        'OPENBLAS_NUM_THREADS': str(threads),
+    }
+
+
+@contextmanager
+def _patched_environ(values):
+    """
+    A spawn-olt munkások a szülő környezetét öröklik: a szálkorlátot már a
+    folyamat indítása előtt beállítjuk (akkor is hat, ha a fő modul importál JAX-ot)
+    """
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _init_worker(counter, threads):
+    """Munkás indítása: saját magcsoport (sched_setaffinity) a munkás sorszáma szerint"""
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    if hasattr(os, 'sched_setaffinity'):
+        available = sorted(os.sched_getaffinity(0))
+        cores = {available[(index * threads + i) % len(available)] for i in range(threads)}
+        os.sched_setaffinity(0, cores)
+
+
+def _run_shard(task):
+    """
+    Egy szelet: task['episodes'] epizód a fordított FluidEnv tréninggel
+    Return: {'q_table', 'visits', 'returns'} NumPy tömbök
+    """
+    import jax
+    from fluid_env import FluidEnv
+    from rl_gardener import RLGardener
+
+    env = FluidEnv(grid_size=task['grid_size'],
+                   steps_per_action=task['steps_per_action'],
+                   target_brain_energy=task['target'],
+                   viscosity_range=task['viscosity_range'])
+    gardener = RLGardener(actions=list(env.actions), seed=task['seed'])
+    if task['q_table'] is not None:
+        gardener.q_table = jax.numpy.asarray(task['q_table'])
+
+    program = env.training_program(task['episodes'], task['steps_per_episode'])
+    q_table, visits, returns = program(
+        gardener.q_table, jax.random.PRNGKey(task['seed']),
+        gardener.alpha, gardener.gamma, gardener.epsilon,
+        gardener.energy_bins, gardener.viscosity_bins
+    )
+    return {'q_table': np.asarray(q_table), 'visits': np.asarray(visits),
+            'returns': np.asarray(returns)[:, 0]}
+
+
+def run_parallel(tasks, workers=None, threads_per_worker=1):
+    """
+    Feladatok futtatása spawn-olt folyamat-készletben
+    Return: eredmények a feladatok sorrendjében (a befejezés sorrendjétől független)
+    """
+    workers = min(workers or os.cpu_count(), len(tasks))
+    ctx = mp.get_context('spawn')
+    counter = ctx.Value('i', 0)
+
+    with _patched_environ(_thread_env(threads_per_worker)):
+        with ctx.Pool(workers, initializer=_init_worker, initargs=(counter, threads_per_worker)) as pool:
+            return pool.map(_run_shard, tasks, chunksize=1)
+
+
+def merge_q_tables(results, initial=None):
+    """
+    Q-táblák összevonása látogatásszámmal súlyozva (determinisztikus, sorrendfüggetlen)
+    Sehol sem látogatott (állapot, akció) párnál az initial (vagy 0) marad.
+    """
+    visits = np.stack([r['visits'] for r in results]).astype(float)
+    q_tables = np.stack([r['q_table'] for r in results])
+    total = visits.sum(axis=0)
+
+    merged = np.zeros_like(q_tables[0]) if initial is None else np.array(initial, dtype=q_tables.dtype)
+    seen = total > 0
+    merged[seen] = (visits * q_tables).sum(axis=0)[seen] / total[seen]
+    return merged, total
+
+
+def _task(seed, episodes, steps_per_episode, grid_size=(64, 64), steps_per_action=10,
+          target=0.25, viscosity_range=(0.0, 1.0), q_table=None):
+    return {'seed': seed, 'episodes': episodes, 'steps_per_episode': steps_per_episode,
+            'grid_size': grid_size, 'steps_per_action': steps_per_action, 'target': target,
+            'viscosity_range': viscosity_range, 'q_table': q_table}
+
+
+def train_parallel(episodes=60, steps_per_episode=50, workers=None, seed=0,
+                   threads_per_worker=1, grid_size=(64, 64)):
+    """
+    train_gardener epizódjai szeletekre bontva, munkásonként független Q-táblával,
+    majd látogatásszámmal súlyozott összevonás.
+    Return: (gardener összevont Q-táblával, returns (episodes,))
+    """
+    import jax.numpy as jnp
+    from rl_gardener import RLGardener
+
+    workers = min(workers or os.cpu_count(), episodes)
+    shards = np.array_split(np.arange(episodes), workers)
+    tasks = [_task(seed + i, len(shard), steps_per_episode, grid_size=grid_size)
+             for i, shard in enumerate(shards)]
+
+    results = run_parallel(tasks, workers, threads_per_worker)
+
+    gardener = RLGardener(seed=seed)
+    q_table, _ = merge_q_tables(results, initial=np.asarray(gardener.q_table))
+    gardener.q_table = jnp.asarray(q_table)
+    return gardener, np.concatenate([r['returns'] for r in results])
+
+
+def sweep(viscosities, targets, episodes=10, steps_per_episode=50, workers=None, seed=0,
+          threads_per_worker=1, grid_size=(64, 64)):
+    """
+    Paraméter-sweep: minden (viszkozitás, cél energia) pár egy külön feladat
+    Return: átlagos epizód hozam (len(viscosities), len(targets)) tömbként
+    """
+    grid = [(v, t) for v in viscosities for t in targets]
+    tasks = [_task(seed + i, episodes, steps_per_episode, grid_size=grid_size,
+                   target=t, viscosity_range=(v, v))
+             for i, (v, t) in enumerate(grid)]
+
+    results = run_parallel(tasks, workers, threads_per_worker)
+    mean_returns = np.array([r['returns'].mean() for r in results])
+    return mean_returns.reshape(len(viscosities), len(targets))
+
+
+if __name__ == "__main__":
+    import time
+
+    print(f"🧵 Párhuzamos Kertész Tréning ({os.cpu_count()} mag)...")
+    t0 = time.perf_counter()
+    gardener, returns = train_parallel(episodes=60, steps_per_episode=50)
+    seconds = time.perf_counter() - t0
+    print(f"   60 epizód: {seconds:.1f} s, átlag reward {returns.mean():.1f}")
+    print("✅ Tréning kész.")
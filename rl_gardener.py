@@ -2,67 +2,163 @@
 RL GARDENER - A Tanuló Kertész
 Q-Learning alapú adaptív szabályozás
 """
+import os
 import numpy as np
 import random
 import matplotlib.pyplot as plt
+import jax
+import jax.numpy as jnp
+from jax import jit
+from checkpoint import save_arrays, load_arrays
 from fluid_stratos import FluidSTRATOS
 
+# Alapértelmezett akciókészlet (az akció ID-k ennek indexei)
+ACTIONS = ["WAIT", "RAISE_BARRIER", "LOWER_BARRIER", "DEEPEN_CHANNEL"]
+
+# A DEEPEN_CHANNEL akció által elérhető legnagyobb csatornamélység
+MAX_CHANNEL_DEPTH = 6.0
+
 class RLGardener:
-    def __init__(self, actions=None, alpha=0.1, gamma=0.9, epsilon=0.1):
+    """
+    Tömb alapú Q-tábla: (állapotok × akciók), egész akció ID-kkal (self.actions indexei)
+    choose_action/learn kötegelten is működik (B környezet egyszerre); a tiszta
+    state_index/epsilon_greedy/q_update függvények fordított ciklusba ágyazhatók.
+    """
+    def __init__(self, actions=None, alpha=0.1, gamma=0.9, epsilon=0.1, seed=None):
         if actions is None:
-            self.actions = ["WAIT", "RAISE_BARRIER", "LOWER_BARRIER", "DEEPEN_CHANNEL"]
+            self.actions = list(ACTIONS)
         else:
             self.actions = actions
             
-        self.q_table = {} # State -> {Action -> Value}
         self.alpha = alpha   # Learning rate
         self.gamma = gamma   # Discount factor
         self.epsilon = epsilon # Exploration rate
         
         # State discretization parameters
-        self.energy_bins = [0.1, 0.2, 0.3, 0.4]
-        self.viscosity_bins = [0.3, 0.7] # Low, Med, High
+        self.energy_bins = jnp.asarray([0.1, 0.2, 0.3, 0.4])
+        self.viscosity_bins = jnp.asarray([0.3, 0.7]) # Low, Med, High
+        self.n_states = (len(self.energy_bins) + 1) * (len(self.viscosity_bins) + 1)
+        
+        self.q_table = jnp.zeros((self.n_states, len(self.actions))) # State -> Action -> Value
+        self.key = jax.random.PRNGKey(random.randrange(2**31) if seed is None else seed)
+        
+    @staticmethod
+    @jit
+    def state_index(brain_energy, viscosity, energy_bins, viscosity_bins):
+        """Diszkretizált állapot egyetlen egész indexként: e_state * n_visc + v_state"""
+        e_state = jnp.digitize(brain_energy, energy_bins)
+        v_state = jnp.digitize(viscosity, viscosity_bins)
+        return e_state * (len(viscosity_bins) + 1) + v_state
+
+    @staticmethod
+    @jit
+    def epsilon_greedy(q_table, states, key, epsilon):
+        """Epsilon-Greedy választás minden állapotra, holtversenyben véletlenszerűen"""
+        explore_key, choice_key, tie_key = jax.random.split(key, 3)
+        q = q_table[states]
+        
+        # Best action - Random break ties
+        ties = jnp.where(q == q.max(axis=-1, keepdims=True),
+                         jax.random.uniform(tie_key, q.shape), -1.0)
+        best = jnp.argmax(ties, axis=-1)
         
+        explore = jax.random.uniform(explore_key, best.shape) < epsilon
+        random_action = jax.random.randint(choice_key, best.shape, 0, q_table.shape[-1])
+        return jnp.where(explore, random_action, best)
+
+    @staticmethod
+    @jit
+    def q_update(q_table, states, actions, rewards, next_states, alpha, gamma):
+        """
+        Q-Learning frissítés egy köteg átmenetre
+        Azonos (állapot, akció) párok TD hibái átlagolódnak, így a frissítés
+        nem függ a köteg sorrendjétől.
+        """
+        states, actions = jnp.ravel(states), jnp.ravel(actions)
+        max_next_q = q_table[jnp.ravel(next_states)].max(axis=-1)
+        td = jnp.ravel(rewards) + gamma * max_next_q - q_table[states, actions]
+        
+        td_sum = jnp.zeros_like(q_table).at[states, actions].add(td)
+        counts = jnp.zeros_like(q_table).at[states, actions].add(1.0)
+        return q_table + alpha * td_sum / jnp.maximum(counts, 1.0)
+
     def get_state(self, brain_energy, viscosity):
-        """Diszkretizálja az állapotot"""
-        e_state = np.digitize(brain_energy, self.energy_bins)
-        v_state = np.digitize(viscosity, self.viscosity_bins)
-        return (e_state, v_state)
+        """Diszkretizálja az állapotot (skalár vagy (B,) tömb)"""
+        state = np.asarray(self.state_index(brain_energy, viscosity,
+                                            self.energy_bins, self.viscosity_bins))
+        return int(state) if state.ndim == 0 else state
     
     def get_q(self, state, action):
-        return self.q_table.get(state, {}).get(action, 0.0)
+        return float(self.q_table[state, action])
     
     def choose_action(self, state):
-        """Epsilon-Greedy választás"""
-        if random.random() < self.epsilon:
-            return random.choice(self.actions)
-        
-        # Best action
-        q_values = {a: self.get_q(state, a) for a in self.actions}
-        # Random break ties
-        max_q = max(q_values.values())
-        best_actions = [a for a, q in q_values.items() if q == max_q]
-        return random.choice(best_actions)
+        """Epsilon-Greedy választás: akció ID (skalár állapotra) vagy (B,) tömb"""
+        self.key, key = jax.random.split(self.key)
+        action = np.asarray(self.epsilon_greedy(self.q_table, jnp.asarray(state), key, self.epsilon))
+        return int(action) if action.ndim == 0 else action
     
     def learn(self, state, action, reward, next_state):
-        """Q-Table frissítése"""
-        current_q = self.get_q(state, action)
-        
-        # Max Q for next state
-        next_q_values = {a: self.get_q(next_state, a) for a in self.actions}
-        max_next_q = max(next_q_values.values()) if next_q_values else 0.0
-        
-        # Q-Learning formula
-        new_q = current_q + self.alpha * (reward + self.gamma * max_next_q - current_q)
-        
-        if state not in self.q_table:
-            self.q_table[state] = {}
-        self.q_table[state][action] = new_q
+        """Q-Table frissítése (egy átmenet vagy egy köteg)"""
+        self.q_table = self.q_update(self.q_table, jnp.asarray(state), jnp.asarray(action),
+                                     jnp.asarray(reward, dtype=self.q_table.dtype),
+                                     jnp.asarray(next_state), self.alpha, self.gamma)
+
+    def checkpoint_state(self):
+        """Mentéshez: (tömbök, meta) - Q-tábla, PRNG kulcs, bin határok és hiperparaméterek"""
+        arrays = {'q_table': np.asarray(self.q_table), 'key': np.asarray(self.key),
+                  'energy_bins': np.asarray(self.energy_bins),
+                  'viscosity_bins': np.asarray(self.viscosity_bins)}
+        meta = {'actions': list(self.actions), 'alpha': float(self.alpha),
+                'gamma': float(self.gamma), 'epsilon': float(self.epsilon)}
+        return arrays, meta
+
+    def save(self, path, compress=None):
+        """Csak a kertész állapota egy checkpoint fájlba (FluidSTRATOS.save(gardener=...) is tárolja)"""
+        arrays, meta = self.checkpoint_state()
+        save_arrays(path, {f"gardener/{name}": value for name, value in arrays.items()},
+                    {'format': 'rl_gardener', 'gardener': meta}, compress)
+
+    @classmethod
+    def load(cls, path):
+        """Kertész betöltése RLGardener.save vagy FluidSTRATOS.save(gardener=...) kimenetéből"""
+        arrays, meta = load_arrays(path, mmap=False)
+        if 'gardener' not in meta:
+            raise ValueError(f"A checkpoint nem tartalmaz kertész állapotot: {path}")
 
-def train_gardener(episodes=50, steps_per_episode=50):
+        config = meta['gardener']
+        gardener = cls(actions=config['actions'], alpha=config['alpha'],
+                       gamma=config['gamma'], epsilon=config['epsilon'], seed=0)
+        gardener.energy_bins = jnp.asarray(arrays['gardener/energy_bins'])
+        gardener.viscosity_bins = jnp.asarray(arrays['gardener/viscosity_bins'])
+        gardener.n_states = (len(gardener.energy_bins) + 1) * (len(gardener.viscosity_bins) + 1)
+        gardener.q_table = jnp.asarray(arrays['gardener/q_table'])
+        gardener.key = jnp.asarray(arrays['gardener/key'])
+        return gardener
+
+def shaped_reward(brain_energy, entropy, target=0.25):
+    """
+    Közös jutalomfüggvény (train_gardener, FluidEnv, vektor környezetek)
+    Tömbökön és fordított kódon belül is működik.
+    """
+    # Cél: Brain energia legyen target ± 0.05 között (0.2 - 0.3), ± 0.1-en belül kis jutalom
+    error = jnp.abs(brain_energy - target)
+    r = jnp.where(error <= 0.05, 1.0, jnp.where(error <= 0.1, 0.1, -1.0))
+    
+    # Entrópia bónusz (ha nem túl kaotikus, de aktív)
+    return r + jnp.where(entropy > 1.5, 0.2, 0.0)
+
+def train_gardener(episodes=50, steps_per_episode=50, checkpoint=None):
+    """
+    checkpoint: fájl útvonal - ha létezik, a kertész onnan folytatja a tanulást,
+                a tréning végén pedig oda mentődik
+    """
     print(f"🤖 Kertész Tanítása ({episodes} epizód)...")
     
-    gardener = RLGardener()
+    if checkpoint is not None and os.path.exists(checkpoint):
+        gardener = RLGardener.load(checkpoint)
+        print(f"   Folytatás: {checkpoint}")
+    else:
+        gardener = RLGardener()
     rewards_history = []
     
     for ep in range(episodes):
@@ -75,6 +171,7 @@ def train_gardener(episodes=50, steps_per_episode=50):
         
         # Kezdeti állapot
         barrier_strength = 0.5
+        channel_depth = 0.0
         stratos.set_barrier((0,0), strength=barrier_strength, width=2.0, barrier_id="brain_shield")
         
         total_reward = 0
@@ -86,15 +183,18 @@ def train_gardener(episodes=50, steps_per_episode=50):
         for t in range(steps_per_episode):
             # 1. Action
             action = gardener.choose_action(state)
+            action_name = gardener.actions[action]
             
             # Apply Action
-            if action == "RAISE_BARRIER":
+            if action_name == "RAISE_BARRIER":
                 barrier_strength += 0.2
-            elif action == "LOWER_BARRIER":
+            elif action_name == "LOWER_BARRIER":
                 barrier_strength -= 0.2
-            elif action == "DEEPEN_CHANNEL":
-                stratos.add_coupling("Intuition", "Logic", strength=2.0)
-            elif action == "WAIT":
+            elif action_name == "DEEPEN_CHANNEL" and channel_depth < MAX_CHANNEL_DEPTH:
+                # Egyetlen ID-s csatorna mélyül, felső korláttal (nem halmozódik a végtelenségig)
+                channel_depth = min(channel_depth + 2.0, MAX_CHANNEL_DEPTH)
+                stratos.set_coupling("Intuition", "Logic", strength=channel_depth, coupling_id="intuition_logic")
+            elif action_name == "WAIT":
                 pass
                 
             # Clamp limits
@@ -109,17 +209,7 @@ def train_gardener(episodes=50, steps_per_episode=50):
             next_state = gardener.get_state(e_brain_new, viscosity)
             
             # 4. Calculate Reward
-            # Cél: Brain energia legyen 0.2 és 0.3 között
-            if 0.2 <= e_brain_new <= 0.3:
-                r = 1.0
-            elif 0.15 <= e_brain_new <= 0.35:
-                r = 0.1
-            else:
-                r = -1.0
-                
-            # Entrópia bónusz (ha nem túl kaotikus, de aktív)
-            if entropy > 1.5:
-                r += 0.2
+            r = float(shaped_reward(e_brain_new, entropy))
             
             # 5. Learn
             gardener.learn(state, action, r, next_state)
@@ -149,6 +239,10 @@ def train_gardener(episodes=50, steps_per_episode=50):
     plt.savefig('learning_curve.png')
     print("📊 Learning curve saved to learning_curve.png")
     
+    if checkpoint is not None:
+        gardener.save(checkpoint)
+        print(f"💾 Kertész mentve: {checkpoint}")
+    
     return gardener
 
 if __name__ == "__main__":
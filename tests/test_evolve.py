@@ -0,0 +1,34 @@
+"""
+Fordított evolúció: gerjesztés nélküli (valós kezdőállapotú) mező is léptethető
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import jax.numpy as jnp
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+from rl_gardener import train_gardener
+
+
+def test_evolve_unkicked_field():
+    stratos = FluidSTRATOS(grid_size=(32, 32))
+    stratos.evolve(steps=10)
+    assert jnp.iscomplexobj(stratos.ψ)
+    assert np.isclose(float(jnp.sum(jnp.abs(stratos.ψ)**2) * stratos.dx**2), 1.0, atol=1e-5)
+
+
+def test_evolve_n_promotes_real_psi():
+    stratos = FluidSTRATOS(grid_size=(32, 32))
+    real_psi = jnp.asarray(np.abs(np.asarray(stratos.ψ)), dtype=stratos.real_dtype)
+    ψ = stratos._evolve_n(real_psi, stratos.V, stratos.g, stratos.dt,
+                          stratos._kinetic_propagator(), stratos.gamma, 10, stratos._coeffs())
+    assert ψ.dtype == stratos.complex_dtype
+
+
+def test_train_gardener_evolves_before_first_kick(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # learning_curve.png ide kerül
+    gardener = train_gardener(episodes=1, steps_per_episode=2)
+    assert gardener.q_table.shape[1] == len(gardener.actions)
@@ -0,0 +1,56 @@
+"""
+Pontosság regresszió: a float32 mező mód-energia trajektóriája a float64-es
+referenciától legfeljebb TOLERANCE-szel térhet el.
+"""
+import os
+import subprocess
+import sys
+
+# float64-hez a JAX x64 módja kell, a JAX első használata előtt
+os.environ.setdefault("JAX_ENABLE_X64", "1")
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import jax
+import numpy as np
+
+from fluid_stratos import FluidSTRATOS
+
+jax.config.update("jax_enable_x64", True)
+
+TOLERANCE = 5e-5   # max |ΔE| a normált mód-energiákon
+STEPS = 300
+RECORD_EVERY = 10
+
+
+def _mode_energies(precision):
+    stratos = FluidSTRATOS(grid_size=(32, 32), precision=precision)
+    stratos.add_barrier((0, 0), strength=0.8, width=2.0, barrier_id="brain_shield")
+    stratos.add_coupling("Intuition", "Logic", strength=3.0)
+    stratos.excite_mode(6, strength=4.0)
+    return stratos.evolve(steps=STEPS, record_every=RECORD_EVERY)['mode_energies'], stratos
+
+
+def test_float32_tracks_float64():
+    e32, s32 = _mode_energies('float32')
+    e64, s64 = _mode_energies('float64')
+
+    assert s32.ψ.dtype == np.complex64 and s64.ψ.dtype == np.complex128
+    assert e32.shape == e64.shape == (STEPS // RECORD_EVERY, 16)
+    assert np.max(np.abs(e32 - e64)) < TOLERANCE
+
+
+def test_float64_without_x64_raises():
+    code = ("from fluid_stratos import FluidSTRATOS\n"
+            "try:\n"
+            "    FluidSTRATOS(grid_size=(16, 16), precision='float64')\n"
+            "except ValueError as error:\n"
+            "    assert 'JAX_ENABLE_X64' in str(error)\n"
+            "else:\n"
+            "    raise SystemExit('nincs ValueError')\n"
+            "import jax\n"
+            "assert not jax.config.read('jax_enable_x64')\n")
+    env = {key: value for key, value in os.environ.items() if key != "JAX_ENABLE_X64"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr + result.stdout
@@ -0,0 +1,176 @@
+"""
+TRAJECTORY - ψ pillanatképek folyamatos írása lemezre
+Egy növekvő .npy fájl (T, ...) alakkal: a fejléc fix méretű, minden kiírt
+darab (chunk) után frissül, így a fájl írás közben is memóriába képezhető,
+és a t. képkocka a többi betöltése nélkül olvasható.
+Mellette az időpontok (.times.npy) és egy .json leíró (mennyiség, rács, ritkítás).
+"""
+import json
+import queue
+import threading
+
+import numpy as np
+
+# Fix fejlécméret: a képkockák száma a fájl átírása nélkül nőhet
+_HEADER_SIZE = 4096
+_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+def _header(dtype, frame_shape, n_frames):
+    """.npy 1.0 fejléc _HEADER_SIZE bájtra kitöltve"""
+    shape = (n_frames,) + tuple(frame_shape)
+    text = f"{{'descr': {np.lib.format.dtype_to_descr(np.dtype(dtype))!r}, " \
+           f"'fortran_order': False, 'shape': {shape}, }}"
+    body_size = _HEADER_SIZE - len(_MAGIC) - 2
+    return _MAGIC + body_size.to_bytes(2, 'little') + text.ljust(body_size - 1).encode('latin1') + b'\n'
+
+
+def _has_data(path):
+    """Üres (0 elemű) .npy nem képezhető memóriába"""
+    with open(path, 'rb') as f:
+        f.seek(_HEADER_SIZE, 0)
+        return bool(f.read(1))
+
+
+class _GrowingArray:
+    """Egy .npy fájl, amelynek első tengelye hozzáfűzéssel nő (fix méretű fejléccel)"""
+
+    def __init__(self, path, item_shape, dtype):
+        self.item_shape = tuple(item_shape)
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self._file = open(path, 'wb')
+        self._file.write(_header(self.dtype, self.item_shape, 0))
+
+    def extend(self, items):
+        """Elemek hozzáfűzése a fájl végére, majd a fejléc (hossz) frissítése"""
+        self._file.seek(0, 2)
+        self._file.write(np.ascontiguousarray(items, dtype=self.dtype).tobytes())
+        self.length += len(items)
+        self._file.seek(0)
+        self._file.write(_header(self.dtype, self.item_shape, self.length))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class TrajectoryWriter:
+    """
+    Háttérszálas képkocka-író korlátos memóriával
+
+    append() a (akár még számolás alatt álló) JAX tömböt egy legfeljebb
+    queue_size elemű sorba teszi és azonnal visszatér; a szál végzi az
+    eszköz -> host másolást és a kiírást chunk_frames-es darabokban. Ha a
+    lemez lassabb a szimulációnál, append() blokkol (a RAM nem nő korlátlanul).
+
+    Fájlok: path (képkockák, (T, ...)), path.times.npy (időpontok, (T,)),
+    path.json (leíró: meta + alak, típus, képkockaszám)
+    """
+
+    def __init__(self, path, frame_shape, dtype, meta=None, queue_size=8, chunk_frames=32):
+        self.path = path
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.meta = dict(meta or {})
+        self.chunk_frames = chunk_frames
+
+        self._frames = _GrowingArray(path, self.frame_shape, self.dtype)
+        self._times = _GrowingArray(f"{path}.times.npy", (), np.float64)
+        self._closed = False
+        self._write_meta()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def n_frames(self):
+        """A lemezre már kiírt képkockák száma"""
+        return self._frames.length
+
+    def _write_meta(self):
+        with open(f"{self.path}.json", 'w') as f:
+            json.dump(dict(self.meta, n_frames=self.n_frames, frame_shape=self.frame_shape,
+                           dtype=self.dtype.str), f, indent=2)
+
+    def _run(self):
+        """Háttérszál: darabok összegyűjtése, kiírás, fejlécek frissítése"""
+        done = False
+        while not done:
+            items = [self._queue.get()]
+            while len(items) < self.chunk_frames and items[-1] is not None:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if items[-1] is None:
+                items.pop()
+                done = True
+            if not items or self._error is not None:
+                continue
+
+            try:
+                frames = np.stack([np.asarray(frame, dtype=self.dtype) for frame, _ in items])
+                # Előbb az idők: egy közben olvasó mindig legalább annyi időt lát, ahány képet
+                self._times.extend([time for _, time in items])
+                self._frames.extend(frames)
+            except Exception as error:  # a hívó szálon append()/close() dobja tovább
+                self._error = error
+
+    def _check(self):
+        if self._error is not None:
+            raise RuntimeError(f"Trajektória írási hiba: {self._error}") from self._error
+
+    def append(self, frame, time=np.nan):
+        """Egy képkocka (frame_shape alakú tömb) és időpontja sorba állítása"""
+        self._check()
+        if self._closed:
+            raise ValueError("A trajektória író már le van zárva")
+        if tuple(frame.shape) != self.frame_shape:
+            raise ValueError(f"Hibás képkocka alak: {tuple(frame.shape)} (várt: {self.frame_shape})")
+        self._queue.put((frame, float(time)))
+
+    def close(self):
+        """A sor kiürítése, a szál leállítása, végső fejlécek és leíró"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._frames.close()
+        self._times.close()
+        self._write_meta()
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Trajektória olvasása memóriába képezve: reader[t] csak a t. képkockát olvassa
+    Írás közben is megnyitható (a már kiírt darabokat látja; refresh() frissít).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(f"{path}.json") as f:
+            self.meta = json.load(f)
+        self.refresh()
+
+    def refresh(self):
+        """A fájlok újra-leképezése (az író azóta kiírt képkockáival együtt)"""
+        load = lambda path: np.load(path, mmap_mode='r') if _has_data(path) else np.load(path)
+        self.frames = load(self.path)
+        self.times = load(f"{self.path}.times.npy")[:len(self.frames)]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]